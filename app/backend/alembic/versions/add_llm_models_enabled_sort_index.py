@@ -0,0 +1,43 @@
+"""add_llm_models_enabled_sort_index
+
+Revision ID: b7c4e2f9a061
+Revises: a1b2c3d4e5f6
+Create Date: 2025-02-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "b7c4e2f9a061"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers get_all_models_from_db: WHERE is_enabled ORDER BY sort_order, id
+    if op.get_bind().dialect.name == "postgresql":
+        # Fail fast rather than queue readers behind a lock; CONCURRENTLY cannot run inside a transaction
+        op.execute("SET lock_timeout = '2s'")
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_llm_models_enabled_sort",
+                "llm_models",
+                ["is_enabled", "sort_order", "id"],
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_include=["display_name", "model_name", "provider"],
+            )
+    else:
+        op.create_index(
+            "ix_llm_models_enabled_sort",
+            "llm_models",
+            ["is_enabled", "sort_order", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_models_enabled_sort", table_name="llm_models")
@@ -0,0 +1,48 @@
+"""add_llm_models_provider_model_unique
+
+Revision ID: c3d9f1a7e2b4
+Revises: b7c4e2f9a061
+Create Date: 2025-02-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c3d9f1a7e2b4"
+down_revision: Union[str, None] = "b7c4e2f9a061"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicate (provider, model_name) rows, keeping the oldest, so the unique index can be built
+    op.execute(
+        "DELETE FROM llm_models WHERE id NOT IN "
+        "(SELECT MIN(id) FROM llm_models GROUP BY provider, model_name)"
+    )
+    # Unique index (not a table constraint) so SQLite can add it without a table rebuild;
+    # it is the conflict target for the OpenRouter refresh upsert
+    if op.get_bind().dialect.name == "postgresql":
+        # Fail fast rather than queue readers behind a lock; CONCURRENTLY cannot run inside a transaction
+        op.execute("SET lock_timeout = '2s'")
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "uq_llm_models_provider_model_name",
+                "llm_models",
+                ["provider", "model_name"],
+                unique=True,
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            "uq_llm_models_provider_model_name",
+            "llm_models",
+            ["provider", "model_name"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_llm_models_provider_model_name", table_name="llm_models")
@@ -14,7 +14,15 @@ DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 # Create SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={
+        "check_same_thread": False,  # Needed for SQLite
+        "cached_statements": 256,  # sqlite3 prepared-statement cache per connection (default 128)
+    },
+    # Keep a warm pool; no per-checkout ping (local file DB), recycle long-lived connections
+    pool_size=10,
+    max_overflow=20,
+    pool_recycle=1800,
+    pool_pre_ping=False,
 )
 
 # Create SessionLocal class
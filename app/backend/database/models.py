@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from .connection import Base
 
@@ -115,6 +115,10 @@ class ApiKey(Base):
 class LLMModel(Base):
     """Table to store available LLM models (cloud + custom). Replaces static api_models.json for the API."""
     __tablename__ = "llm_models"
+    __table_args__ = (
+        Index("ix_llm_models_enabled_sort", "is_enabled", "sort_order", "id"),  # enabled-model listing
+        Index("uq_llm_models_provider_model_name", "provider", "model_name", unique=True),  # upsert target
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
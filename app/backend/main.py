@@ -1,20 +1,24 @@
+import asyncio
 import logging
 import os
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
-logger = logging.getLogger(__name__)
-# Avoid httpx INFO logs for Ollama/API health checks (e.g. GET .../api/tags 503 when Ollama is not running)
-logging.getLogger("httpx").setLevel(logging.WARNING)
-
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.backend.routes import api_router
-from app.backend.database.connection import engine
+from app.backend.database.connection import engine, SessionLocal
 from app.backend.database.models import Base
+from app.backend.services.model_list_service import seed_from_json_if_empty
 from app.backend.services.ollama_service import ollama_service
+from src.prompts import log_render_vars
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s")
+logger = logging.getLogger(__name__)
+# Avoid httpx INFO logs for Ollama/API health checks (e.g. GET .../api/tags 503 when Ollama is not running)
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # 从项目根目录加载 .env（override=True 确保以 .env 为准，覆盖 shell 里可能存在的旧 key）
 _env_path = Path(__file__).resolve().parents[2] / ".env"
@@ -40,10 +44,12 @@ try:
 except Exception:
     pass
 
-app = FastAPI(title="AI Hedge Fund API", description="Backend API for AI Hedge Fund", version="0.1.0")
-
-# Initialize database tables (this is safe to run multiple times)
-Base.metadata.create_all(bind=engine)
+app = FastAPI(
+    title="AI Hedge Fund API",
+    description="Backend API for AI Hedge Fund",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -57,9 +63,29 @@ app.add_middleware(
 # Include all routes
 app.include_router(api_router)
 
+def _seed_model_list() -> None:
+    """Seed llm_models from api_models.json in its own session (runs in a worker thread)."""
+    db = SessionLocal()
+    try:
+        seed_from_json_if_empty(db)
+    except Exception as e:
+        logger.warning(f"Could not seed llm_models: {e}")
+    finally:
+        db.close()
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Startup event to check Ollama availability."""
+    """Startup event to create tables, seed the model list and check Ollama availability."""
+    # Create missing tables off the event loop; set AUTO_CREATE_TABLES=0 when Alembic manages the schema
+    if os.getenv("AUTO_CREATE_TABLES", "1") == "1":
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+
+    # Seeding is synchronous DB I/O too; keep it off the event loop as well
+    await asyncio.to_thread(_seed_model_list)
+
+    log_render_vars()
+
     try:
         logger.info("Checking Ollama availability...")
         status = await ollama_service.check_ollama_status()
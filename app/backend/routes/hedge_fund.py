@@ -16,7 +16,7 @@ from app.backend.services.graph import (
     run_graph_async,
 )
 from src.utils.langfuse_callback import langfuse_flush
-from src.utils.report import generate_final_report
+from src.utils.report import generate_final_report_async
 from src.utils.langsmith_tracing import langsmith_flush
 from app.backend.services.portfolio import create_portfolio
 from app.backend.services.backtest_service import BacktestService
@@ -158,15 +158,11 @@ async def run(request_data: HedgeFundRequest, request: Request, db: Session = De
                 # 研报由 portfolio_manager 输出；若无则回退到 generate_final_report
                 if not (report and report.strip()):
                     try:
-                        loop = asyncio.get_running_loop()
-                        report = await loop.run_in_executor(
-                            None,
-                            lambda: generate_final_report(
-                                decisions=decisions,
-                                analyst_signals=analyst_signals,
-                                current_prices=current_prices,
-                                state=result,
-                            ),
+                        report = await generate_final_report_async(
+                            decisions=decisions,
+                            analyst_signals=analyst_signals,
+                            current_prices=current_prices,
+                            state=result,
                         )
                     except Exception:
                         report = ""
@@ -1,25 +1,89 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import hashlib
+import logging
+import os
+from itertools import groupby
+from operator import itemgetter
+
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import List, Dict, Any
 
 from app.backend.models.schemas import ErrorResponse
-from app.backend.database import get_db
+from app.backend.database import get_db, SessionLocal
 from app.backend.services.ollama_service import OllamaService
 from app.backend.services.model_list_service import (
-    get_all_models_from_db,
-    seed_from_json_if_empty,
+    get_all_models_by_provider_cached,
+    get_all_models_cached,
+    get_models_version,
     refresh_openrouter_models,
 )
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/language-models")
 
 ollama_service = OllamaService()
 
+_CACHE_CONTROL = "private, max-age=30"
+# A stalled Ollama server must not hold up the cloud model list; generous enough for a cold or
+# remote host, override with HEDGEFUND_OLLAMA_TIMEOUT_SEC
+_OLLAMA_TIMEOUT_SEC = 5.0
+
 
 def _cloud_models(db: Session) -> List[Dict[str, Any]]:
-    """Cloud models from DB; seed from static JSON if table empty."""
-    seed_from_json_if_empty(db)
-    return get_all_models_from_db(db)
+    """Cloud models from DB (seeded from static JSON at startup)."""
+    return get_all_models_cached(db)
+
+
+def _cloud_models_in_thread() -> List[Dict[str, Any]]:
+    """Like _cloud_models, but with its own session so it can run off the event loop."""
+    db = SessionLocal()
+    try:
+        return _cloud_models(db)
+    finally:
+        db.close()
+
+
+def _ollama_timeout_sec() -> float:
+    try:
+        return float(os.getenv("HEDGEFUND_OLLAMA_TIMEOUT_SEC") or _OLLAMA_TIMEOUT_SEC)
+    except ValueError:
+        return _OLLAMA_TIMEOUT_SEC
+
+
+async def _ollama_models() -> List[Dict[str, Any]]:
+    """Live Ollama models, or [] (with a warning) if Ollama does not answer within the timeout."""
+    timeout = _ollama_timeout_sec()
+    try:
+        return await asyncio.wait_for(ollama_service.get_available_models(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Ollama did not list its models within %.1fs; returning cloud models only "
+            "(raise HEDGEFUND_OLLAMA_TIMEOUT_SEC for slow hosts)", timeout
+        )
+        return []
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check (RFC 9110 weak comparison): comma-separated list, W/ prefixes ignored, * matches."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Set ETag/Cache-Control on the response; return a 304 if the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
 
 
 @router.get(
@@ -29,13 +93,20 @@ def _cloud_models(db: Session) -> List[Dict[str, Any]]:
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
 )
-async def get_language_models(db: Session = Depends(get_db)):
-    """Get cloud models from DB (with seed if empty) and live Ollama models."""
+async def get_language_models(request: Request, response: Response):
+    """Get cloud models from DB and live Ollama models."""
     try:
-        models = _cloud_models(db)
-        ollama_models = await ollama_service.get_available_models()
-        models.extend(ollama_models)
-        return {"models": models}
+        # Ollama models change independently of the DB, so fold them into the ETag. They can only be
+        # known by listing Ollama, so a 304 skips the DB read and the body, not the Ollama round-trip.
+        ollama_models = await _ollama_models()
+        ollama_digest = hashlib.md5(
+            "\n".join(m["model_name"] for m in ollama_models).encode()
+        ).hexdigest()[:12]
+        not_modified = _not_modified(request, response, f'W/"{get_models_version()}-{ollama_digest}"')
+        if not_modified is not None:
+            return not_modified
+        models = await asyncio.to_thread(_cloud_models_in_thread)
+        return {"models": models + ollama_models}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve models: {str(e)}")
 
@@ -47,20 +118,26 @@ async def get_language_models(db: Session = Depends(get_db)):
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
 )
-async def get_language_model_providers(db: Session = Depends(get_db)):
-    """Get providers and models from DB (with seed if empty), grouped by provider."""
+async def get_language_model_providers(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get providers and models from DB, grouped by provider."""
     try:
-        models = _cloud_models(db)
-        providers = {}
-        for model in models:
-            provider_name = model["provider"]
-            if provider_name not in providers:
-                providers[provider_name] = {"name": provider_name, "models": []}
-            providers[provider_name]["models"].append({
-                "display_name": model["display_name"],
-                "model_name": model["model_name"],
-            })
-        return {"providers": list(providers.values())}
+        # The ETag is just the models version, so a conditional GET returns before any DB read
+        not_modified = _not_modified(request, response, f'W/"{get_models_version()}"')
+        if not_modified is not None:
+            return not_modified
+        # Rows arrive ordered by provider, so each provider is one contiguous group
+        models = get_all_models_by_provider_cached(db)
+        providers = [
+            {
+                "name": provider_name,
+                "models": [
+                    {"display_name": m["display_name"], "model_name": m["model_name"]}
+                    for m in group
+                ],
+            }
+            for provider_name, group in groupby(models, key=itemgetter("provider"))
+        ]
+        return {"providers": providers}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve providers: {str(e)}")
 
@@ -73,7 +150,7 @@ async def get_language_model_providers(db: Session = Depends(get_db)):
     },
 )
 async def refresh_openrouter(db: Session = Depends(get_db)):
-    """Fetch current model list from OpenRouter and update DB (replaces existing OpenRouter models)."""
+    """Fetch current model list from OpenRouter and upsert into DB (stale OpenRouter models are removed)."""
     try:
         deleted, inserted = refresh_openrouter_models(db)
         return {"deleted": deleted, "inserted": inserted, "message": "OpenRouter models refreshed"}
@@ -1,21 +1,23 @@
 import asyncio
 import json
 import logging
+import os
 import re
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
 
 from app.backend.services.agent_service import create_agent_function
-
-_log = logging.getLogger(__name__)
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.main import start
-from src.utils.company_context import build_company_context
+from src.utils.company_context import build_company_context, company_context_scope
 from src.utils.analysts import ANALYST_CONFIG
 from src.utils.langfuse_callback import get_langfuse_callbacks
+from src.utils.llm import start_prompt_cache_warmup, warm_prompt_names
 from src.graph.state import AgentState
 
+_log = logging.getLogger(__name__)
+
 
 def extract_base_agent_key(unique_id: str) -> str:
     """
@@ -37,6 +39,11 @@ def extract_base_agent_key(unique_id: str) -> str:
     return unique_id  # Return original if no suffix pattern found
 
 
+def count_analyst_nodes(node_ids) -> int:
+    """Number of analyst nodes among node_ids (unique ids like warren_buffett_abc123)."""
+    return sum(1 for node_id in node_ids if extract_base_agent_key(node_id) in ANALYST_CONFIG)
+
+
 # Helper function to create the agent graph
 def create_graph(graph_nodes: list, graph_edges: list) -> StateGraph:
     """Create the workflow based on the React Flow graph structure."""
@@ -163,6 +170,13 @@ def run_graph(
     if request is not None and getattr(request, "api_keys", None):
         api_key = request.api_keys.get("FINANCIAL_DATASETS_API_KEY")
     company_context = build_company_context(tickers, api_key=api_key)
+    if os.getenv("HEDGEFUND_WARM_PROMPT_CACHE") == "1":
+        start_prompt_cache_warmup(
+            model_name,
+            model_provider,
+            warm_prompt_names(extract_base_agent_key(node_id) for node_id in graph.nodes),
+            getattr(request, "api_keys", None),
+        )
     for t in tickers:
         ctx = company_context.get(t, {})
         if ctx.get("name"):
@@ -170,42 +184,44 @@ def run_graph(
         else:
             _log.warning("  company_context %s: no data (get_company_facts returned none or empty)", t)
     # Build a short summary of companies for the initial message so downstream nodes see context
-    company_lines = []
-    for t in tickers:
-        ctx = company_context.get(t, {})
-        name = ctx.get("name") or t
-        sector = ctx.get("sector") or "—"
-        industry = ctx.get("industry") or "—"
-        company_lines.append(f"  • {t}: {name} (Sector: {sector}, Industry: {industry})")
-    companies_summary = "\n".join(company_lines) if company_lines else "  (no company details)"
+    def _line(t: str) -> str:
+        ctx = company_context.get(t) or {}
+        return f"  • {t}: {ctx.get('name') or t} (Sector: {ctx.get('sector') or '—'}, Industry: {ctx.get('industry') or '—'})"
+
+    companies_summary = "\n".join(_line(t) for t in tickers) or "  (no company details)"
     initial_content = (
         "Make trading decisions based on the provided data.\n\n"
         "Companies under analysis:\n" + companies_summary
     )
     callbacks = get_langfuse_callbacks(tags=["hedge-fund", "web"])
-    config = {"callbacks": callbacks} if callbacks else {}
-    return graph.invoke(
-        {
-            "messages": [
-                HumanMessage(content=initial_content),
-            ],
-            "data": {
-                "tickers": tickers,
-                "portfolio": portfolio,
-                "start_date": start_date,
-                "end_date": end_date,
-                "analyst_signals": {},
-                "company_context": company_context,
+    # Analysts share one superstep; size the executor so all of them run concurrently (same cap
+    # as src/main.run_hedge_fund: selected analysts, not start/risk/portfolio manager nodes)
+    config = {"max_concurrency": max(count_analyst_nodes(graph.nodes), 1)}
+    if callbacks:
+        config["callbacks"] = callbacks
+    # company_context is served to agents via a context var rather than graph state
+    with company_context_scope(company_context):
+        return graph.invoke(
+            {
+                "messages": [
+                    HumanMessage(content=initial_content),
+                ],
+                "data": {
+                    "tickers": tickers,
+                    "portfolio": portfolio,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "analyst_signals": {},
+                },
+                "metadata": {
+                    "show_reasoning": False,
+                    "model_name": model_name,
+                    "model_provider": model_provider,
+                    "request": request,  # Pass the request for agent-specific model access
+                },
             },
-            "metadata": {
-                "show_reasoning": False,
-                "model_name": model_name,
-                "model_provider": model_provider,
-                "request": request,  # Pass the request for agent-specific model access
-            },
-        },
-        config=config,
-    )
+            config=config,
+        )
 
 
 def parse_hedge_fund_response(response):
@@ -3,11 +3,19 @@ Model list service: read/write LLM models from DB, seed from static JSON, refres
 """
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import httpx
+import orjson
+from sqlalchemy import insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.backend.database.models import LLMModel as LLMModelRow
@@ -16,41 +24,113 @@ logger = logging.getLogger(__name__)
 
 # Path to static api_models.json (used for seed when DB is empty)
 API_MODELS_JSON_PATH = (
-    Path(__file__).resolve().parents[2] / "src" / "llm" / "api_models.json"
+    Path(__file__).resolve().parents[3] / "src" / "llm" / "api_models.json"
 )
 OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
+# Shared client so repeated refreshes reuse a warm keep-alive connection to openrouter.ai
+_OR_CLIENT = httpx.Client(timeout=30)
+atexit.register(_OR_CLIENT.close)
+# Rows per multi-VALUES upsert statement during an OpenRouter refresh
+_UPSERT_BATCH_SIZE = 100
+
+# Process-local caches of the enabled model list (by sort order / by provider); invalidated on seed/refresh
+_CACHE_TTL = 60
+_MODELS_CACHE: dict[str, Any] = {"data": None, "ts": 0.0}
+_PROVIDER_MODELS_CACHE: dict[str, Any] = {"data": None, "ts": 0.0}
+_MODELS_CACHE_LOCK = threading.Lock()
+
+# Bumped whenever the model table changes; used as the HTTP ETag for listings.
+# Starts from the wall clock so a restarted process never reuses an old version.
+_VERSION = time.time_ns()
+
+# Set once the table is known to be populated, so repeated seed calls are free
+_seeded = False
 
 
 def get_all_models_from_db(db: Session) -> list[dict[str, Any]]:
     """Return all enabled models from DB as list of {display_name, model_name, provider}."""
-    rows = (
-        db.query(LLMModelRow)
-        .filter(LLMModelRow.is_enabled.is_(True))
+    # Column-only select: skips ORM instance hydration for what is a pure projection
+    stmt = (
+        select(LLMModelRow.display_name, LLMModelRow.model_name, LLMModelRow.provider)
+        .where(LLMModelRow.is_enabled.is_(True))
         .order_by(LLMModelRow.sort_order, LLMModelRow.id)
-        .all()
     )
     return [
-        {
-            "display_name": r.display_name,
-            "model_name": r.model_name,
-            "provider": r.provider,
-        }
-        for r in rows
+        {"display_name": display_name, "model_name": model_name, "provider": provider}
+        for display_name, model_name, provider in db.execute(stmt)
+    ]
+
+
+def get_all_models_ordered_by_provider(db: Session) -> list[dict[str, Any]]:
+    """Like get_all_models_from_db, but ordered by provider first so rows can be grouped in one pass."""
+    stmt = (
+        select(LLMModelRow.display_name, LLMModelRow.model_name, LLMModelRow.provider)
+        .where(LLMModelRow.is_enabled.is_(True))
+        .order_by(LLMModelRow.provider, LLMModelRow.sort_order, LLMModelRow.id)
+    )
+    return [
+        {"display_name": display_name, "model_name": model_name, "provider": provider}
+        for display_name, model_name, provider in db.execute(stmt)
     ]
 
 
+def _read_through(cache: dict[str, Any], loader, db: Session) -> list[dict[str, Any]]:
+    """Return cache["data"] while fresh (see _CACHE_TTL); otherwise reload it with loader(db)."""
+    data = cache["data"]
+    if data is not None and time.monotonic() - cache["ts"] < _CACHE_TTL:
+        return data
+    with _MODELS_CACHE_LOCK:
+        data = cache["data"]
+        if data is not None and time.monotonic() - cache["ts"] < _CACHE_TTL:
+            return data
+        data = loader(db)
+        cache["data"] = data
+        cache["ts"] = time.monotonic()
+        return data
+
+
+def get_all_models_cached(db: Session) -> list[dict[str, Any]]:
+    """Return enabled models, served from the in-memory cache while it is fresh."""
+    return _read_through(_MODELS_CACHE, get_all_models_from_db, db)
+
+
+def get_all_models_by_provider_cached(db: Session) -> list[dict[str, Any]]:
+    """Return enabled models ordered by provider, served from the in-memory cache while it is fresh."""
+    return _read_through(_PROVIDER_MODELS_CACHE, get_all_models_ordered_by_provider, db)
+
+
+def invalidate_models_cache() -> None:
+    """Drop the cached model lists so the next read goes to the DB, and bump the models version."""
+    global _VERSION
+    with _MODELS_CACHE_LOCK:
+        for cache in (_MODELS_CACHE, _PROVIDER_MODELS_CACHE):
+            cache["data"] = None
+            cache["ts"] = 0.0
+        _VERSION += 1
+
+
+def get_models_version() -> int:
+    """Monotonic counter of model table changes made by this process (seed/refresh)."""
+    return _VERSION
+
+
 def seed_from_json_if_empty(db: Session) -> int:
     """
     If llm_models table is empty, seed from api_models.json. Returns number of rows inserted.
+    Called once at startup; later calls in the same process short-circuit.
     """
-    count = db.query(LLMModelRow).count()
-    if count > 0:
+    global _seeded
+    if _seeded:
+        return 0
+    if db.query(LLMModelRow.id).limit(1).first() is not None:
+        _seeded = True
         return 0
     if not API_MODELS_JSON_PATH.exists():
         logger.warning("api_models.json not found at %s, skipping seed", API_MODELS_JSON_PATH)
         return 0
     with open(API_MODELS_JSON_PATH, encoding="utf-8") as f:
         data = json.load(f)
+    mappings = []
     for i, item in enumerate(data):
         if not isinstance(item, dict):
             continue
@@ -59,32 +139,44 @@ def seed_from_json_if_empty(db: Session) -> int:
         provider = item.get("provider") or "OpenRouter"
         if not display_name or not model_name:
             continue
-        row = LLMModelRow(
-            display_name=display_name,
-            model_name=model_name,
-            provider=provider,
-            sort_order=i,
-            is_enabled=True,
-            source="static",
+        mappings.append(
+            {
+                "display_name": display_name,
+                "model_name": model_name,
+                "provider": provider,
+                "sort_order": i,
+                "is_enabled": True,
+                "source": "static",
+            }
         )
-        db.add(row)
+    if mappings:
+        # ORM bulk INSERT: one executemany, no per-row unit-of-work or RETURNING of generated ids
+        db.execute(insert(LLMModelRow), mappings)
     db.commit()
-    logger.info("Seeded llm_models from api_models.json: %s rows", len(data))
-    return len(data)
+    _seeded = True
+    invalidate_models_cache()
+    logger.info("Seeded llm_models from api_models.json: %s rows", len(mappings))
+    return len(mappings)
+
+
+def _upsert_insert(db: Session):
+    """Dialect-specific INSERT construct supporting ON CONFLICT (Postgres and SQLite)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(LLMModelRow)
+    return sqlite.insert(LLMModelRow)
 
 
 def refresh_openrouter_models(db: Session) -> tuple[int, int]:
     """
     Fetch current models from OpenRouter API and upsert into DB.
-    Replaces all existing rows with provider=OpenRouter, then inserts new from API.
-    Returns (deleted_count, inserted_count).
+    Upserts on (provider, model_name), then removes OpenRouter rows not touched by this refresh,
+    all in one transaction so readers never see an empty OpenRouter list.
+    Returns (deleted_count, upserted_count).
     """
     try:
-        import urllib.request
-
-        req = urllib.request.Request(OPENROUTER_MODELS_URL)
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            body = json.loads(resp.read().decode())
+        resp = _OR_CLIENT.get(OPENROUTER_MODELS_URL)
+        resp.raise_for_status()
+        body = orjson.loads(resp.content)
     except Exception as e:
         logger.exception("Failed to fetch OpenRouter models: %s", e)
         raise
@@ -92,26 +184,53 @@ def refresh_openrouter_models(db: Session) -> tuple[int, int]:
     data = body.get("data") or []
     # OpenRouter returns list of { id, name, ... }; we use id as model_name, name as display_name
     to_insert = []
+    seen: set[str] = set()
     for m in data:
         model_id = m.get("id")
         name = m.get("name") or model_id
-        if not model_id:
+        if not model_id or model_id in seen:
             continue
+        seen.add(model_id)
         to_insert.append({"model_name": model_id, "display_name": name, "provider": "OpenRouter"})
 
-    deleted = db.query(LLMModelRow).filter(LLMModelRow.provider == "OpenRouter").delete()
-    db.commit()
-
-    for i, item in enumerate(to_insert):
-        row = LLMModelRow(
-            display_name=item["display_name"],
-            model_name=item["model_name"],
-            provider="OpenRouter",
-            sort_order=i,
-            is_enabled=True,
-            source="openrouter",
+    refreshed_at = datetime.now(timezone.utc)
+    try:
+        rows = [
+            {
+                **item,
+                "sort_order": i,
+                "is_enabled": True,
+                "source": "openrouter",
+                "updated_at": refreshed_at,
+            }
+            for i, item in enumerate(to_insert)
+        ]
+        # Batched to stay under SQLite's bound-parameter limit; still a single transaction
+        for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+            stmt = _upsert_insert(db).values(rows[start : start + _UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["provider", "model_name"],
+                set_={
+                    "display_name": stmt.excluded.display_name,
+                    "sort_order": stmt.excluded.sort_order,
+                    "is_enabled": stmt.excluded.is_enabled,
+                    "source": stmt.excluded.source,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            db.execute(stmt)
+        deleted = (
+            db.query(LLMModelRow)
+            .filter(
+                LLMModelRow.provider == "OpenRouter",
+                or_(LLMModelRow.updated_at.is_(None), LLMModelRow.updated_at != refreshed_at),
+            )
+            .delete(synchronize_session=False)
         )
-        db.add(row)
-    db.commit()
-    logger.info("Refresh OpenRouter: deleted=%s, inserted=%s", deleted, len(to_insert))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_models_cache()
+    logger.info("Refresh OpenRouter: deleted=%s, upserted=%s", deleted, len(to_insert))
     return deleted, len(to_insert)
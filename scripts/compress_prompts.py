@@ -0,0 +1,94 @@
+#!/usr/bin/env -S uv run python
+"""
+Offline LLMLingua-2 compression of the verbose persona system prompts.
+
+Compresses the persona text of each target prompt (the shared JSON schema tail is kept
+verbatim), checks that placeholders and literal JSON braces survived, and writes the result
+to src/prompts/compressed_prompts.json, which the prompt loader serves in place of the registry
+defaults when HEDGEFUND_COMPRESSED_PROMPTS=1. Review the output (and compare signals against
+the uncompressed prompts on a fixed set of tickers) before turning it on.
+
+Requires the optional llmlingua package (not a project dependency):
+  uv pip install llmlingua
+  uv run scripts/compress_prompts.py [--rate 0.5] [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import orjson
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+MODEL_NAME = "microsoft/llmlingua-2-xlm-roberta-large-meetingbank"
+TARGET_PROMPTS = (
+    "hedge-fund/cathie_wood",
+    "hedge-fund/phil_fisher",
+    "hedge-fund/peter_lynch",
+    "hedge-fund/rakesh_jhunjhunwala",
+    "hedge-fund/stanley_druckenmiller",
+)
+FORCE_TOKENS = ["{ticker}", "{analysis_data}", "JSON", "bullish", "bearish", "neutral", "\n"]
+
+
+def _split_schema(content: str, schema: str) -> tuple[str, str]:
+    """(compressible persona text, verbatim tail)."""
+    if content.endswith(schema):
+        return content[: -len(schema)], schema
+    return content, ""
+
+
+def _check(name: str, original: str, compressed: str) -> list[str]:
+    """Problems that would break rendering or the reply contract."""
+    problems = []
+    for token in ("{ticker}", "{analysis_data}", "{{", "}}"):
+        if original.count(token) != compressed.count(token):
+            problems.append(f"{name}: '{token}' count changed")
+    if "JSON" in original and "JSON" not in compressed:
+        problems.append(f"{name}: JSON instruction dropped")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=0.5, help="Target keep rate (default 0.5)")
+    parser.add_argument("--dry-run", action="store_true", help="Print results without writing the JSON file")
+    args = parser.parse_args()
+
+    try:
+        from llmlingua import PromptCompressor
+    except ImportError:
+        print("llmlingua is not installed; run `uv pip install llmlingua` first.")
+        return 1
+
+    from src.prompts.registry import COMPRESSED_PROMPTS_PATH, DEFAULT_PROMPTS, SIGNAL_JSON_SCHEMA
+
+    compressor = PromptCompressor(model_name=MODEL_NAME, use_llmlingua2=True)
+    out: dict[str, list[dict[str, str]]] = {}
+    problems: list[str] = []
+    for name in TARGET_PROMPTS:
+        messages = [dict(m) for m in DEFAULT_PROMPTS[name]]
+        system = messages[0]
+        text, tail = _split_schema(system["content"], SIGNAL_JSON_SCHEMA)
+        result = compressor.compress_prompt(text, rate=args.rate, force_tokens=FORCE_TOKENS)
+        compressed = result["compressed_prompt"].strip() + ("\n\n" + tail if tail else "")
+        problems += _check(name, system["content"], compressed)
+        print(f"{name}: {len(system['content'])} -> {len(compressed)} chars")
+        system["content"] = compressed
+        out[name] = messages
+
+    if problems:
+        print("Not written; compressed prompts failed checks:\n  " + "\n  ".join(problems))
+        return 1
+    if not args.dry_run:
+        Path(COMPRESSED_PROMPTS_PATH).write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+        print(f"Wrote {COMPRESSED_PROMPTS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,48 +6,64 @@ Only pushes prompts that have changed (compared to the current production versio
 Requires LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY in the environment (or .env).
 Prompts are created/updated with label "production".
 
+A local .langfuse_sync_cache.json records a hash of each prompt as last synced; prompts whose
+local content is unchanged are skipped without contacting Langfuse. Pass --force to re-check all.
+
 Usage:
-  uv run scripts/sync_prompts_to_langfuse.py
+  uv run scripts/sync_prompts_to_langfuse.py [--force]
   # or from project root:
   python -m scripts.sync_prompts_to_langfuse
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import orjson
 
 # Ensure project root is on path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
 
 LABEL = "production"
+# Remote prompts are fetched concurrently; each get_prompt is one HTTPS round-trip
+FETCH_WORKERS = 16
+# name -> digest of the registry messages last synced successfully
+SYNC_CACHE_PATH = Path(PROJECT_ROOT) / ".langfuse_sync_cache.json"
+
+
+# LangChain variables used by the registry prompts
+_PROMPT_VARS = (
+    "ticker",
+    "analysis_data",
+    "facts",
+    "confidence",
+    "signals",
+    "allowed",
+    "context",
+    "company_context_block",
+)
+_PLACEHOLDER_RE = re.compile("|".join(re.escape("{" + var + "}") for var in _PROMPT_VARS))
 
 
 def _langfuse_content(content: str) -> str:
-    """Convert LangChain placeholders {var} to Langfuse placeholders {{var}}."""
-    for var in (
-        "ticker",
-        "analysis_data",
-        "facts",
-        "confidence",
-        "signals",
-        "allowed",
-        "context",
-        "company_context_block",
-    ):
-        content = content.replace("{" + var + "}", "{{" + var + "}}")
-    return content
-
-
-def _local_prompt_messages(messages: list[dict]) -> list[dict]:
-    """Build list of {role, content} for Langfuse from registry messages."""
-    return [
-        {"role": m["role"], "content": _langfuse_content(m["content"])}
-        for m in messages
-    ]
-
-
-def _remote_prompt_messages(pf) -> list[dict] | None:
-    """Extract list of {role, content} from Langfuse prompt client. None if not chat."""
+    """Convert LangChain placeholders {var} to Langfuse placeholders {{var}} in a single pass."""
+    return _PLACEHOLDER_RE.sub(lambda m: "{" + m.group(0) + "}", content)
+
+
+def _local_prompt_messages(messages: Sequence[Mapping[str, str]]) -> list[tuple[str, str]]:
+    """Build list of (role, content) for Langfuse from registry messages."""
+    return [(m["role"], _langfuse_content(m["content"])) for m in messages]
+
+
+def _remote_prompt_messages(pf) -> list[tuple[str, str]] | None:
+    """Extract list of (role, content) from Langfuse prompt client. None if not chat."""
     if not hasattr(pf, "prompt"):
         return None
     out = []
@@ -59,17 +75,43 @@ def _remote_prompt_messages(pf) -> list[dict] | None:
         content = (
             m.get("content", "") if isinstance(m, dict) else getattr(m, "content", "")
         )
-        out.append({"role": role, "content": content})
+        out.append((role, content))
     return out if out else None
 
 
-def _prompt_messages_equal(a: list[dict], b: list[dict]) -> bool:
-    if len(a) != len(b):
-        return False
-    for i, (ma, mb) in enumerate(zip(a, b)):
-        if ma.get("role") != mb.get("role") or ma.get("content") != mb.get("content"):
-            return False
-    return True
+def _prompt_messages_equal(a: list[tuple[str, str]], b: list[tuple[str, str]]) -> bool:
+    return a == b
+
+
+def _messages_digest(messages: Sequence[Mapping[str, str]], scope: str) -> str:
+    """Stable hash of registry messages (pre-conversion) for one Langfuse target, to detect local changes."""
+    pairs = [(m["role"], m["content"]) for m in messages]
+    return hashlib.blake2b(orjson.dumps([scope, pairs]), digest_size=16).hexdigest()
+
+
+def _load_sync_cache() -> dict[str, str]:
+    try:
+        with open(SYNC_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sync_cache(cache: dict[str, str]) -> None:
+    try:
+        with open(SYNC_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError as e:
+        print(f"Could not write {SYNC_CACHE_PATH}: {e}", file=sys.stderr)
+
+
+def _safe_get_prompt(client, name: str):
+    """Fetch the labelled remote prompt, or None if it is missing or the request fails."""
+    try:
+        return client.get_prompt(name, label=LABEL)
+    except Exception:
+        return None
 
 
 def main() -> int:
@@ -84,33 +126,52 @@ def main() -> int:
     from src.prompts.registry import DEFAULT_PROMPTS
 
     client = get_client()
+    force = "--force" in sys.argv[1:]
+    cache = {} if force else _load_sync_cache()
+    # Switching Langfuse host/project or label invalidates every cached entry
+    scope = "|".join(
+        (os.getenv("LANGFUSE_BASE_URL") or os.getenv("LANGFUSE_HOST") or "", os.getenv("LANGFUSE_PUBLIC_KEY", ""), LABEL)
+    )
+    digests = {name: _messages_digest(messages, scope) for name, messages in DEFAULT_PROMPTS.items()}
+    names = [name for name in DEFAULT_PROMPTS if cache.get(name) != digests[name]]
+    cached = len(DEFAULT_PROMPTS) - len(names)
+    # Convert once up front (only prompts that need checking); reused for diffing and upload
+    local_messages = {name: _local_prompt_messages(DEFAULT_PROMPTS[name]) for name in names}
     updated = 0
     skipped = 0
-    for name, messages in DEFAULT_PROMPTS.items():
-        local = _local_prompt_messages(messages)
-        try:
-            pf = client.get_prompt(name, label=LABEL)
-            remote = _remote_prompt_messages(pf)
+    try:
+        if names:
+            with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(names))) as ex:
+                remotes = dict(zip(names, ex.map(lambda n: _safe_get_prompt(client, n), names)))
+        for name in names:
+            local = local_messages[name]
+            pf = remotes[name]
+            # Prompt missing or not chat → will create/update
+            remote = _remote_prompt_messages(pf) if pf is not None else None
             if remote is not None and _prompt_messages_equal(local, remote):
                 print(f"Skipped (unchanged): {name}")
+                cache[name] = digests[name]
                 skipped += 1
                 continue
-        except Exception:
-            # Prompt missing or not chat → will create/update
-            pass
-        try:
-            client.create_prompt(
-                name=name,
-                type="chat",
-                prompt=local,  # type: ignore[arg-type]
-                labels=[LABEL],
-            )
-            print(f"Created/updated prompt: {name}")
-            updated += 1
-        except Exception as e:
-            print(f"Failed {name}: {e}", file=sys.stderr)
-            return 1
-    print(f"Done. Updated {updated}, skipped {skipped} unchanged.")
+            try:
+                client.create_prompt(
+                    name=name,
+                    type="chat",
+                    prompt=[{"role": role, "content": content} for role, content in local],  # type: ignore[arg-type]
+                    labels=[LABEL],
+                )
+                print(f"Created/updated prompt: {name}")
+                cache[name] = digests[name]
+                updated += 1
+            except Exception as e:
+                print(f"Failed {name}: {e}", file=sys.stderr)
+                return 1
+    finally:
+        _save_sync_cache(cache)
+    print(
+        f"Done. Updated {updated}, skipped {skipped} unchanged, "
+        f"{cached} unchanged since last sync (use --force to re-check)."
+    )
     return 0
 
 
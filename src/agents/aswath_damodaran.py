@@ -5,7 +5,7 @@ from typing_extensions import Literal
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 
 from src.tools.api import (
@@ -370,8 +370,7 @@ def generate_damodaran_output(
       • Emphasize risk, growth, and cash-flow assumptions
       • Cite cost of capital, implied MOS, and valuation cross-checks
     """
-    template = get_prompt_template("hedge-fund/aswath_damodaran")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/aswath_damodaran", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     def default_signal():
         return AswathDamodaranSignal(
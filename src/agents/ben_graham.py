@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_batched, render_prompt
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -17,6 +17,10 @@ class BenGrahamSignal(BaseModel):
     reasoning: str
 
 
+class BenGrahamBatchOutput(BaseModel):
+    signals: dict[str, BenGrahamSignal]
+
+
 def ben_graham_agent(state: AgentState, agent_id: str = "ben_graham_agent"):
     """
     Analyzes stocks using Benjamin Graham's classic value-investing principles:
@@ -67,14 +71,18 @@ def ben_graham_agent(state: AgentState, agent_id: str = "ben_graham_agent"):
 
         analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "earnings_analysis": earnings_analysis, "strength_analysis": strength_analysis, "valuation_analysis": valuation_analysis}
 
+    # One LLM call for all tickers (sharded by token budget) instead of one per ticker; a lone
+    # ticker keeps the per-ticker prompt, which the cheap-model cascade can answer
+    for ticker in tickers:
         progress.update_status(agent_id, ticker, "Generating Ben Graham analysis")
-        graham_output = generate_graham_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-            agent_id=agent_id,
-        )
+    if len(tickers) == 1:
+        output = generate_graham_output(ticker=tickers[0], analysis_data=analysis_data, state=state, agent_id=agent_id)
+        graham_outputs = {tickers[0]: output}
+    else:
+        graham_outputs = generate_graham_outputs(analysis_data=analysis_data, state=state, agent_id=agent_id)
 
+    for ticker in tickers:
+        graham_output = graham_outputs[ticker]
         graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
 
         progress.update_status(agent_id, ticker, "Done", analysis=graham_output.reasoning)
@@ -291,11 +299,7 @@ def generate_graham_output(
     - Return the result in a JSON structure: { signal, confidence, reasoning }.
     """
 
-    template = get_prompt_template("hedge-fund/ben_graham")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
-
-    def create_default_ben_graham_signal():
-        return BenGrahamSignal(signal="neutral", confidence=0.0, reasoning="Error in generating analysis; defaulting to neutral.")
+    prompt = render_prompt("hedge-fund/ben_graham", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     return call_llm(
         prompt=prompt,
@@ -304,3 +308,31 @@ def generate_graham_output(
         state=state,
         default_factory=create_default_ben_graham_signal,
     )
+
+
+def generate_graham_outputs(
+    analysis_data: dict[str, dict],
+    state: AgentState,
+    agent_id: str,
+) -> dict[str, BenGrahamSignal]:
+    """
+    Batched generate_graham_output: one call per token-budget shard of tickers, through the
+    hedge-fund/ben_graham__batched variant. Tickers missing from a reply default to neutral.
+    """
+    outputs = {}
+    for shard_tickers, prompt in render_batched("hedge-fund/ben_graham", analysis_data):
+        result = call_llm(
+            prompt=prompt,
+            pydantic_model=BenGrahamBatchOutput,
+            agent_name=agent_id,
+            state=state,
+            default_factory=lambda: BenGrahamBatchOutput(signals={}),
+        )
+        signals = result.signals if result else {}
+        for ticker in shard_tickers:
+            outputs[ticker] = signals.get(ticker) or create_default_ben_graham_signal()
+    return outputs
+
+
+def create_default_ben_graham_signal() -> BenGrahamSignal:
+    return BenGrahamSignal(signal="neutral", confidence=0.0, reasoning="Error in generating analysis; defaulting to neutral.")
@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -407,8 +407,7 @@ def generate_ackman_output(
     Includes more explicit references to brand strength, activism potential, 
     catalysts, and management changes in the system prompt.
     """
-    template = get_prompt_template("hedge-fund/bill_ackman")
-    prompt = template.invoke({
+    prompt = render_prompt("hedge-fund/bill_ackman", {
         "analysis_data": json.dumps(analysis_data, indent=2),
         "ticker": ticker
     })
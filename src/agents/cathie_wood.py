@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -369,8 +369,7 @@ def generate_cathie_wood_output(
     """
     Generates investment decisions in the style of Cathie Wood.
     """
-    template = get_prompt_template("hedge-fund/cathie_wood")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/cathie_wood", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     def create_default_cathie_wood_signal():
         return CathieWoodSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
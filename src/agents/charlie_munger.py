@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items, get_insider_trades, get_company_news
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -821,8 +821,7 @@ def generate_munger_output(
     confidence_hint: int,
 ) -> CharlieMungerSignal:
     facts_bundle = make_munger_facts_bundle(analysis_data)
-    template = get_prompt_template("hedge-fund/charlie_munger")
-    prompt = template.invoke({
+    prompt = render_prompt("hedge-fund/charlie_munger", {
         "ticker": ticker,
         "facts": json.dumps(facts_bundle, separators=(",", ":"), ensure_ascii=False),
         "confidence": confidence_hint,
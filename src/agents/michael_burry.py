@@ -5,7 +5,7 @@ import json
 from typing_extensions import Literal
 
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 
@@ -321,8 +321,7 @@ def _generate_burry_output(
 ) -> MichaelBurrySignal:
     """Call the LLM to craft the final trading signal in Burry's voice."""
 
-    template = get_prompt_template("hedge-fund/michael_burry")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/michael_burry", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     # Default fallback signal in case parsing fails
     def create_default_michael_burry_signal():
@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
@@ -310,8 +310,7 @@ def generate_pabrai_output(
     agent_id: str,
 ) -> MohnishPabraiSignal:
     """Generate Pabrai-style decision focusing on low risk, high uncertainty bets and cloning."""
-    template = get_prompt_template("hedge-fund/mohnish_pabrai")
-    prompt = template.invoke({
+    prompt = render_prompt("hedge-fund/mohnish_pabrai", {
         "analysis_data": json.dumps(analysis_data, indent=2),
         "ticker": ticker,
     })
@@ -5,7 +5,7 @@ from src.tools.api import (
     get_insider_trades,
     get_company_news,
 )
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
@@ -447,8 +447,7 @@ def generate_lynch_output(
     """
     Generates a final JSON signal in Peter Lynch's voice & style.
     """
-    template = get_prompt_template("hedge-fund/peter_lynch")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/peter_lynch", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     def create_default_signal():
         return PeterLynchSignal(
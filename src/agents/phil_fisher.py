@@ -5,7 +5,7 @@ from src.tools.api import (
     get_insider_trades,
     get_company_news,
 )
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
@@ -537,8 +537,7 @@ def generate_fisher_output(
     """
     Generates a JSON signal in the style of Phil Fisher.
     """
-    template = get_prompt_template("hedge-fund/phil_fisher")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/phil_fisher", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     def create_default_signal():
         return PhilFisherSignal(
@@ -3,7 +3,7 @@ import time
 from langchain_core.messages import HumanMessage
 
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from pydantic import BaseModel, Field
 from typing_extensions import Literal
 from src.utils.progress import progress
@@ -216,12 +216,13 @@ def generate_trading_decision(
     compact_signals = _compact_signals({t: signals_by_ticker.get(t, {}) for t in tickers_for_llm})
     compact_allowed = {t: allowed_actions_full[t] for t in tickers_for_llm}
 
-    template = get_prompt_template("hedge-fund/portfolio_manager")
+    # Decisions only; the Markdown report is a separate hedge-fund/final_report call made by the caller when wanted
+    # Analysts finish in arbitrary order, so sort keys: identical inputs render identical prompt bytes
     prompt_data = {
-        "signals": json.dumps(compact_signals, separators=(",", ":"), ensure_ascii=False),
-        "allowed": json.dumps(compact_allowed, separators=(",", ":"), ensure_ascii=False),
+        "signals": json.dumps(compact_signals, sort_keys=True, separators=(",", ":"), ensure_ascii=False),
+        "allowed": json.dumps(compact_allowed, sort_keys=True, separators=(",", ":"), ensure_ascii=False),
     }
-    prompt = template.invoke(prompt_data)
+    prompt = render_prompt("hedge-fund/portfolio_manager__decisions", prompt_data)
 
     # Default factory fills remaining tickers as hold if the LLM fails
     def create_default_portfolio_output():
@@ -233,19 +234,28 @@ def generate_trading_decision(
             )
         return PortfolioManagerOutput(decisions=decisions)
 
-    def create_default_with_report():
-        out = create_default_portfolio_output()
-        return PortfolioManagerOutput(decisions=out.decisions, report=None)
-
     llm_out = call_llm(
         prompt=prompt,
         pydantic_model=PortfolioManagerOutput,
         agent_name=agent_id,
         state=state,
-        default_factory=create_default_with_report,
+        default_factory=create_default_portfolio_output,
     )
 
-    # Merge prefilled holds with LLM results
+    # Merge prefilled holds with LLM results, enforcing the allowed actions/quantities in code
     merged = dict(prefilled_decisions)
-    merged.update(llm_out.decisions)
-    return PortfolioManagerOutput(decisions=merged, report=llm_out.report)
+    for t in tickers_for_llm:
+        merged[t] = _enforce_allowed(llm_out.decisions.get(t), compact_allowed[t])
+    return PortfolioManagerOutput(decisions=merged)
+
+
+def _enforce_allowed(decision: PortfolioDecision | None, allowed: dict[str, int]) -> PortfolioDecision:
+    """Clamp an LLM decision to the deterministic constraints: a disallowed action becomes hold, quantity ≤ max."""
+    if decision is None:
+        return PortfolioDecision(action="hold", quantity=0, confidence=0, reasoning="Default decision: hold")
+    if decision.action not in allowed:
+        return decision.model_copy(update={"action": "hold", "quantity": 0})
+    quantity = max(0, min(decision.quantity, allowed[decision.action]))
+    if quantity != decision.quantity:
+        return decision.model_copy(update={"quantity": quantity})
+    return decision
@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
@@ -648,8 +648,7 @@ def generate_jhunjhunwala_output(
     agent_id: str,
 ) -> RakeshJhunjhunwalaSignal:
     """Get investment decision from LLM with Jhunjhunwala's principles"""
-    template = get_prompt_template("hedge-fund/rakesh_jhunjhunwala")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/rakesh_jhunjhunwala", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     # Default fallback signal in case parsing fails
     def create_default_rakesh_jhunjhunwala_signal():
@@ -7,7 +7,7 @@ from src.tools.api import (
     get_company_news,
     get_prices,
 )
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
@@ -535,8 +535,7 @@ def generate_druckenmiller_output(
     """
     Generates a JSON signal in the style of Stanley Druckenmiller.
     """
-    template = get_prompt_template("hedge-fund/stanley_druckenmiller")
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    prompt = render_prompt("hedge-fund/stanley_druckenmiller", {"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
     def create_default_signal():
         return StanleyDruckenmillerSignal(
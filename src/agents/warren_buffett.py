@@ -1,5 +1,5 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.prompts import get_prompt_template
+from src.prompts import render_prompt
 from src.utils.company_context import format_company_context_for_prompt
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel, Field
@@ -744,6 +744,32 @@ def analyze_pricing_power(financial_line_items: list, metrics: list) -> dict[str
     }
 
 
+def apply_buffett_rules(analysis_data: dict[str, any]) -> dict[str, any]:
+    """
+    Deterministic part of the Buffett signal rules, computed here instead of asking the LLM:
+    bullish = strong business AND margin_of_safety > 0; bearish = poor business OR clearly
+    overvalued; otherwise (or with missing data) neutral.
+    """
+    score = analysis_data.get("score")
+    max_score = analysis_data.get("max_score")
+    margin_of_safety = analysis_data.get("margin_of_safety")
+    quality = score / max_score if score is not None and max_score else None
+
+    if quality is None or margin_of_safety is None:
+        preliminary_signal = "neutral"
+    elif quality >= 0.7 and margin_of_safety > 0:
+        preliminary_signal = "bullish"
+    elif quality <= 0.4 or margin_of_safety < -0.3:
+        preliminary_signal = "bearish"
+    else:
+        preliminary_signal = "neutral"
+
+    return {
+        "preliminary_signal": preliminary_signal,
+        "moat_score": analysis_data.get("moat_analysis", {}).get("score"),
+    }
+
+
 def generate_buffett_output(
         ticker: str,
         analysis_data: dict[str, any],
@@ -766,11 +792,11 @@ def generate_buffett_output(
         "market_cap": analysis_data.get("market_cap"),
         "margin_of_safety": analysis_data.get("margin_of_safety"),
     }
+    facts.update(apply_buffett_rules(analysis_data))
 
     company_context_str = format_company_context_for_prompt(ticker, state["data"])
-    company_context_block = f"Company context: {company_context_str}\n            " if company_context_str else ""
-    template = get_prompt_template("hedge-fund/warren_buffett")
-    prompt = template.invoke({
+    company_context_block = f"Company context: {company_context_str}\n" if company_context_str else ""
+    prompt = render_prompt("hedge-fund/warren_buffett", {
         "facts": json.dumps(facts, separators=(",", ":"), ensure_ascii=False),
         "ticker": ticker,
         "company_context_block": company_context_block,
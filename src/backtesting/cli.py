@@ -9,8 +9,9 @@ from colorama import Fore, Style, init
 import questionary
 
 from .engine import BacktestEngine
-from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
+from src.llm.models import get_llm_order, get_ollama_llm_order, get_model_info, ModelProvider
 from src.utils.analysts import ANALYST_ORDER
+from src.utils.display import print_cascade_summary
 from src.main import run_hedge_fund
 from src.utils.ollama import ensure_ollama_and_model
 
@@ -76,7 +77,7 @@ def main() -> int:
         print(f"{Fore.CYAN}Using Ollama for local LLM inference.{Style.RESET_ALL}")
         model_name = questionary.select(
             "Select your Ollama model:",
-            choices=[questionary.Choice(display, value=value) for display, value, _ in OLLAMA_LLM_ORDER],
+            choices=[questionary.Choice(display, value=value) for display, value, _ in get_ollama_llm_order()],
             style=questionary.Style(
                 [
                     ("selected", "fg:green bold"),
@@ -104,7 +105,7 @@ def main() -> int:
     else:
         model_choice = questionary.select(
             "Select your LLM model:",
-            choices=[questionary.Choice(display, value=(name, provider)) for display, name, provider in LLM_ORDER],
+            choices=[questionary.Choice(display, value=(name, provider)) for display, name, provider in get_llm_order()],
             style=questionary.Style(
                 [
                     ("selected", "fg:green bold"),
@@ -160,6 +161,7 @@ def main() -> int:
             print(f"Max DD: {md:.2f}% on {metrics['max_drawdown_date']}")
         else:
             print(f"Max DD: {md:.2f}%")
+    print_cascade_summary()
 
     return 0
 
@@ -35,6 +35,8 @@ class AgentController:
             model_name=model_name,
             model_provider=model_provider,
             selected_analysts=list(selected_analysts) if selected_analysts is not None else None,
+            # Backtests only consume decisions; skip the Markdown report call on every step
+            generate_report=False,
         )
 
         # Normalize outputs to avoid None/missing keys
@@ -6,7 +6,7 @@ import questionary
 from colorama import Fore, Style
 
 from src.utils.analysts import ANALYST_ORDER
-from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider, find_model_by_name
+from src.llm.models import get_llm_order, get_ollama_llm_order, get_model_info, ModelProvider, find_model_by_name
 from src.utils.ollama import ensure_ollama_and_model
 
 from dataclasses import dataclass
@@ -120,7 +120,7 @@ def select_model(use_ollama: bool, model_flag: str | None = None) -> tuple[str,
         print(f"{Fore.CYAN}Using Ollama for local LLM inference.{Style.RESET_ALL}")
         model_name = questionary.select(
             "Select your Ollama model:",
-            choices=[questionary.Choice(display, value=value) for display, value, _ in OLLAMA_LLM_ORDER],
+            choices=[questionary.Choice(display, value=value) for display, value, _ in get_ollama_llm_order()],
             style=questionary.Style(
                 [
                     ("selected", "fg:green bold"),
@@ -152,7 +152,7 @@ def select_model(use_ollama: bool, model_flag: str | None = None) -> tuple[str,
     else:
         model_choice = questionary.select(
             "Select your LLM model:",
-            choices=[questionary.Choice(display, value=(name, provider)) for display, name, provider in LLM_ORDER],
+            choices=[questionary.Choice(display, value=(name, provider)) for display, name, provider in get_llm_order()],
             style=questionary.Style(
                 [
                     ("selected", "fg:green bold"),
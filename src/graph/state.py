@@ -14,7 +14,8 @@ def merge_dicts(a: dict[str, Any], b: dict[str, Any]) -> dict[str, Any]:
 
 # Define agent state
 # data typically contains: tickers, portfolio, start_date, end_date, analyst_signals,
-# company_context (ticker -> {name, sector, industry, ...}), and optionally current_prices
+# and optionally current_prices. company_context (ticker -> {name, sector, industry, ...})
+# is provided per run via src.utils.company_context.company_context_scope.
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
     data: Annotated[dict[str, Any], merge_dicts]
@@ -1,25 +1,31 @@
+from __future__ import annotations
+
 import os
 import json
 import logging
-from langchain_anthropic import ChatAnthropic
-from langchain_deepseek import ChatDeepSeek
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from langchain_xai import ChatXAI
-from langchain_openai import ChatOpenAI, AzureChatOpenAI
-from langchain_gigachat import GigaChat
-from langchain_ollama import ChatOllama
-from langchain_core.language_models import BaseChatModel
-from enum import Enum
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import lru_cache
 from pydantic import BaseModel, SecretStr
-from typing import Tuple, List
+from typing import TYPE_CHECKING, Callable, Tuple, List
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _json_loads = json.loads
+
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseChatModel
+
+# Provider SDKs (langchain_openai, langchain_anthropic, ...) are imported inside the client factories
+# so a run only pays the import cost of the provider it actually uses.
+
 logger = logging.getLogger(__name__)
 
 
-class ModelProvider(str, Enum):
-    """Enum for supported LLM providers"""
+class ModelProvider(StrEnum):
+    """Enum for supported LLM providers. Members are plain strings equal to (and hashing like) their value."""
 
     ALIBABA = "Alibaba"
     ANTHROPIC = "Anthropic"
@@ -39,6 +45,10 @@ class ModelProvider(str, Enum):
     IDEALAB = "IDEALAB"
 
 
+# Provider value -> member, so get_model skips Enum value resolution on every call
+_PROVIDER_BY_VALUE: dict[str, ModelProvider] = {p: p for p in ModelProvider}
+
+
 class LLMModel(BaseModel):
     """Represents an LLM model configuration"""
 
@@ -48,7 +58,7 @@ class LLMModel(BaseModel):
 
     def to_choice_tuple(self) -> Tuple[str, str, str]:
         """Convert to format needed for questionary choices"""
-        return (self.display_name, self.model_name, self.provider.value)
+        return (self.display_name, self.model_name, self.provider)
 
     def is_custom(self) -> bool:
         """Check if the model is a Gemini model"""
@@ -82,21 +92,19 @@ class LLMModel(BaseModel):
 # Load models from JSON file
 def load_models_from_json(json_path: str) -> List[LLMModel]:
     """Load models from a JSON file"""
-    with open(json_path, 'r') as f:
-        models_data = json.load(f)
+    with open(json_path, 'rb') as f:
+        models_data = _json_loads(f.read())
     
-    models = []
-    for model_data in models_data:
-        # Convert string provider to ModelProvider enum
-        provider_enum = ModelProvider(model_data["provider"])
-        models.append(
-            LLMModel(
-                display_name=model_data["display_name"],
-                model_name=model_data["model_name"],
-                provider=provider_enum
-            )
+    # Trusted, bundled data: model_construct skips pydantic validation for every entry at import.
+    # Unknown providers still raise ValueError through ModelProvider().
+    return [
+        LLMModel.model_construct(
+            display_name=model_data["display_name"],
+            model_name=model_data["model_name"],
+            provider=_PROVIDER_BY_VALUE.get(model_data["provider"]) or ModelProvider(model_data["provider"]),
         )
-    return models
+        for model_data in models_data
+    ]
 
 
 # Get the path to the JSON files
@@ -110,23 +118,35 @@ AVAILABLE_MODELS = load_models_from_json(str(models_json_path))
 # Load Ollama models from JSON
 OLLAMA_MODELS = load_models_from_json(str(ollama_models_json_path))
 
-# Create LLM_ORDER in the format expected by the UI
-LLM_ORDER = [model.to_choice_tuple() for model in AVAILABLE_MODELS]
+@lru_cache(maxsize=1)
+def get_llm_order() -> list[tuple[str, str, str]]:
+    """Cloud model choices in the format expected by the CLI (built on first use)."""
+    return [model.to_choice_tuple() for model in AVAILABLE_MODELS]
+
 
-# Create Ollama LLM_ORDER separately
-OLLAMA_LLM_ORDER = [model.to_choice_tuple() for model in OLLAMA_MODELS]
+@lru_cache(maxsize=1)
+def get_ollama_llm_order() -> list[tuple[str, str, str]]:
+    """Ollama model choices in the format expected by the CLI (built on first use)."""
+    return [model.to_choice_tuple() for model in OLLAMA_MODELS]
+
+
+# Lookup indices over AVAILABLE_MODELS + OLLAMA_MODELS (first occurrence wins, as with a linear scan).
+_MODELS_BY_NAME_PROVIDER: dict[tuple[str, str], LLMModel] = {}
+_MODELS_BY_NAME: dict[str, LLMModel] = {}
+for _model in AVAILABLE_MODELS + OLLAMA_MODELS:
+    _MODELS_BY_NAME_PROVIDER.setdefault((_model.model_name, _model.provider), _model)
+    _MODELS_BY_NAME.setdefault(_model.model_name, _model)
+del _model
 
 
 def get_model_info(model_name: str, model_provider: str) -> LLMModel | None:
     """Get model information by model_name"""
-    all_models = AVAILABLE_MODELS + OLLAMA_MODELS
-    return next((model for model in all_models if model.model_name == model_name and model.provider == model_provider), None)
+    return _MODELS_BY_NAME_PROVIDER.get((model_name, model_provider))
 
 
 def find_model_by_name(model_name: str) -> LLMModel | None:
     """Find a model by its name across all available models."""
-    all_models = AVAILABLE_MODELS + OLLAMA_MODELS
-    return next((model for model in all_models if model.model_name == model_name), None)
+    return _MODELS_BY_NAME.get(model_name)
 
 
 def get_models_list():
@@ -135,17 +155,35 @@ def get_models_list():
         {
             "display_name": model.display_name,
             "model_name": model.model_name,
-            "provider": model.provider.value
+            "provider": model.provider
         }
         for model in AVAILABLE_MODELS
     ]
 
 
+# Memoized os.getenv: env is fixed once .env has been loaded, and get_model reads it on every build
+_ENV_CACHE: dict[str, str | None] = {}
+
+
+def _env(name: str, default: str | None = None) -> str | None:
+    """os.getenv(name, default) with the lookup memoized for the life of the process."""
+    try:
+        value = _ENV_CACHE[name]
+    except KeyError:
+        value = _ENV_CACHE[name] = os.getenv(name)
+    return default if value is None else value
+
+
+def reset_cache() -> None:
+    """清除缓存的环境变量与据此构建的模型客户端（测试中修改环境变量后调用）。"""
+    _ENV_CACHE.clear()
+    _get_model_cached.cache_clear()
+
+
+@lru_cache(maxsize=8)
 def _normalize_openai_base_url(base_url: str) -> str:
-    """ChatOpenAI 会追加 /chat/completions，故 base_url 只能到 /v1。若已含 /v1/chat/completions 则先去掉该后缀。"""
-    base_url = base_url.rstrip("/")
-    if base_url.endswith("/v1/chat/completions"):
-        return base_url[: -len("/chat/completions")]
+    """ChatOpenAI 会追加 /chat/completions，故 base_url 只能到 /v1。若已含 /chat/completions 则先去掉该后缀。"""
+    base_url = base_url.rstrip("/").removesuffix("/chat/completions")
     if not base_url.endswith("/v1"):
         base_url = f"{base_url}/v1"
     return base_url
@@ -154,7 +192,7 @@ def _normalize_openai_base_url(base_url: str) -> str:
 def _get_api_key(api_keys: dict[str, str] | None, env_var: str, provider_value: str) -> str | None:
     """从环境变量或 api_keys 取 key。优先使用 .env（与 notebook 一致），其次请求/数据库中的 key。"""
     d = api_keys or {}
-    from_env = os.getenv(env_var)
+    from_env = _env(env_var)
     from_dict = d.get(env_var) or d.get(provider_value)
     key = from_env or from_dict
     if env_var == "DASHSCOPE_API_KEY" and key:
@@ -164,44 +202,137 @@ def _get_api_key(api_keys: dict[str, str] | None, env_var: str, provider_value:
     return key
 
 
+def _chat_groq(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_groq import ChatGroq
+    return ChatGroq(model=model_name, api_key=SecretStr(api_key))
+
+
+def _chat_openai(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=model_name,
+        api_key=SecretStr(api_key),
+        base_url=_env("OPENAI_API_BASE"),
+    )
+
+
+def _chat_anthropic(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_anthropic import ChatAnthropic
+    return ChatAnthropic(
+        model_name=model_name,
+        api_key=SecretStr(api_key),
+    )
+
+
+def _chat_deepseek(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_deepseek import ChatDeepSeek
+    return ChatDeepSeek(model=model_name, api_key=SecretStr(api_key))
+
+
+def _chat_google(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        api_key=SecretStr(api_key),
+    )
+
+
+def _chat_openrouter(model_name: str, api_key: str) -> BaseChatModel:
+    # Get optional site URL and name for headers
+    site_url = _env("YOUR_SITE_URL", "https://github.com/virattt/ai-hedge-fund")
+    site_name = _env("YOUR_SITE_NAME", "AI Hedge Fund")
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=model_name,
+        api_key=SecretStr(api_key),
+        base_url="https://openrouter.ai/api/v1",
+        model_kwargs={
+            "extra_headers": {
+                "HTTP-Referer": site_url,
+                "X-Title": site_name,
+            },
+        },
+    )
+
+
+def _chat_xai(model_name: str, api_key: str) -> BaseChatModel:
+    from langchain_xai import ChatXAI
+    return ChatXAI(model=model_name, api_key=SecretStr(api_key))
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """Provider whose client needs only an API key: env var to resolve it from, label for errors, factory."""
+
+    env_var: str
+    label: str
+    factory: Callable[[str, str], BaseChatModel]
+
+
+# Key-only providers, dispatched by dict lookup; the rest keep explicit branches in _build_model
+_PROVIDERS: dict[ModelProvider, ProviderSpec] = {
+    ModelProvider.GROQ: ProviderSpec("GROQ_API_KEY", "Groq", _chat_groq),
+    ModelProvider.OPENAI: ProviderSpec("OPENAI_API_KEY", "OpenAI", _chat_openai),
+    ModelProvider.ANTHROPIC: ProviderSpec("ANTHROPIC_API_KEY", "Anthropic", _chat_anthropic),
+    ModelProvider.DEEPSEEK: ProviderSpec("DEEPSEEK_API_KEY", "DeepSeek", _chat_deepseek),
+    ModelProvider.GOOGLE: ProviderSpec("GOOGLE_API_KEY", "Google", _chat_google),
+    ModelProvider.OPENROUTER: ProviderSpec("OPENROUTER_API_KEY", "OpenRouter", _chat_openrouter),
+    ModelProvider.XAI: ProviderSpec("XAI_API_KEY", "xAI", _chat_xai),
+}
+
+
 def get_model(
     model_name: str,
     model_provider: ModelProvider | str,
     api_keys: dict[str, str] | None = None,
 ) -> BaseChatModel | None:
-    if isinstance(model_provider, str):
-        model_provider = ModelProvider(model_provider)
-    provider_value = model_provider.value
+    """
+    Return a chat model client for the given model/provider.
+
+    Clients are memoized per (provider, model, api_keys), so agents sharing a configuration
+    reuse one client and its HTTP connection pool instead of rebuilding it on every call.
+    """
+    if not isinstance(model_provider, ModelProvider):
+        # Unknown values still go through ModelProvider() so they raise ValueError as before
+        model_provider = _PROVIDER_BY_VALUE.get(model_provider) or ModelProvider(model_provider)
+    return _get_model_cached(model_name, model_provider, frozenset((api_keys or {}).items()))
+
+
+@lru_cache(maxsize=32)
+def _get_model_cached(
+    model_name: str,
+    model_provider: ModelProvider,
+    api_key_items: frozenset[tuple[str, str]],
+) -> BaseChatModel | None:
+    """Build once per distinct configuration; failures (missing keys) are not cached."""
+    return _build_model(model_name, model_provider, dict(api_key_items) or None)
 
+
+def _build_model(
+    model_name: str,
+    model_provider: ModelProvider,
+    api_keys: dict[str, str] | None,
+) -> BaseChatModel | None:
     api_keys_keys = list((api_keys or {}).keys())
     logger.info(
         "LLM get_model model=%s provider=%s api_keys_providers=%s",
-        model_name, provider_value, api_keys_keys,
+        model_name, model_provider, api_keys_keys,
     )
 
-    if model_provider == ModelProvider.GROQ:
-        api_key = _get_api_key(api_keys, "GROQ_API_KEY", provider_value)
+    spec = _PROVIDERS.get(model_provider)
+    if spec is not None:
+        api_key = _get_api_key(api_keys, spec.env_var, model_provider)
         if not api_key:
             # Print error to console
-            print(f"API Key Error: Please make sure GROQ_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("Groq API key not found.  Please make sure GROQ_API_KEY is set in your .env file or provided via API keys.")
-        return ChatGroq(model=model_name, api_key=SecretStr(api_key))
-    elif model_provider == ModelProvider.OPENAI:
-        # Get and validate API key
-        api_key = _get_api_key(api_keys, "OPENAI_API_KEY", provider_value)
-        base_url = os.getenv("OPENAI_API_BASE")
-        if not api_key:
-            # Print error to console
-            print(f"API Key Error: Please make sure OPENAI_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("OpenAI API key not found.  Please make sure OPENAI_API_KEY is set in your .env file or provided via API keys.")
-        return ChatOpenAI(
-            model=model_name,
-            api_key=SecretStr(api_key),
-            base_url=base_url,
-        )
-    elif model_provider == ModelProvider.OPENAI_COMPATIBLE:
-        api_key = _get_api_key(api_keys, "OPENAI_COMPATIBLE_API_KEY", provider_value)
-        base_url = (api_keys or {}).get("OPENAI_COMPATIBLE_BASE_URL") or os.getenv("OPENAI_COMPATIBLE_BASE_URL")
+            print(f"API Key Error: Please make sure {spec.env_var} is set in your .env file or provided via API keys.")
+            raise ValueError(f"{spec.label} API key not found. Please make sure {spec.env_var} is set in your .env file or provided via API keys.")
+        return spec.factory(model_name, api_key)
+
+    # Providers with their own key/base-URL resolution
+    if model_provider == ModelProvider.OPENAI_COMPATIBLE:
+        api_key = _get_api_key(api_keys, "OPENAI_COMPATIBLE_API_KEY", model_provider)
+        base_url = (api_keys or {}).get("OPENAI_COMPATIBLE_BASE_URL") or _env("OPENAI_COMPATIBLE_BASE_URL")
         if not api_key:
             raise ValueError(
                 "OpenAI 兼容 API key 未配置。请在 .env 中设置 OPENAI_COMPATIBLE_API_KEY，或通过 API keys 传入。"
@@ -211,20 +342,21 @@ def get_model(
                 "OpenAI 兼容 Base URL 未配置。请在 .env 中设置 OPENAI_COMPATIBLE_BASE_URL（例如自建服务或第三方兼容 endpoint）。"
             )
         base_url = _normalize_openai_base_url(base_url)
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=model_name,
             api_key=SecretStr(api_key),
             base_url=base_url,
         )
     elif model_provider == ModelProvider.IDEALAB:
-        api_key = _get_api_key(api_keys, "IDEALAB_API_KEY", provider_value) or _get_api_key(
-            api_keys, "OPENAI_COMPATIBLE_API_KEY", provider_value
+        api_key = _get_api_key(api_keys, "IDEALAB_API_KEY", model_provider) or _get_api_key(
+            api_keys, "OPENAI_COMPATIBLE_API_KEY", model_provider
         )
         base_url = (
             (api_keys or {}).get("IDEALAB_BASE_URL")
-            or os.getenv("IDEALAB_BASE_URL")
+            or _env("IDEALAB_BASE_URL")
             or (api_keys or {}).get("OPENAI_COMPATIBLE_BASE_URL")
-            or os.getenv("OPENAI_COMPATIBLE_BASE_URL")
+            or _env("OPENAI_COMPATIBLE_BASE_URL")
         )
         if not api_key:
             raise ValueError(
@@ -235,14 +367,15 @@ def get_model(
                 "IDEALAB Base URL 未配置。请在 .env 中设置 IDEALAB_BASE_URL 或 OPENAI_COMPATIBLE_BASE_URL。"
             )
         base_url = _normalize_openai_base_url(base_url)
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=model_name,
             api_key=SecretStr(api_key),
             base_url=base_url,
         )
     elif model_provider == ModelProvider.DASHSCOPE:
-        api_key = _get_api_key(api_keys, "DASHSCOPE_API_KEY", provider_value)
-        base_url = (api_keys or {}).get("DASHSCOPE_BASE_URL") or os.getenv(
+        api_key = _get_api_key(api_keys, "DASHSCOPE_API_KEY", model_provider)
+        base_url = (api_keys or {}).get("DASHSCOPE_BASE_URL") or _env(
             "DASHSCOPE_BASE_URL",
             "https://dashscope.aliyuncs.com/compatible-mode/v1",
         )
@@ -254,76 +387,29 @@ def get_model(
         base_url = base_url.rstrip("/")
         if not base_url.endswith("/v1"):
             base_url = f"{base_url}/v1"
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=model_name,
             api_key=SecretStr(api_key),
             base_url=base_url,
         )
-    elif model_provider == ModelProvider.ANTHROPIC:
-        api_key = _get_api_key(api_keys, "ANTHROPIC_API_KEY", provider_value)
-        if not api_key:
-            print(f"API Key Error: Please make sure ANTHROPIC_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("Anthropic API key not found.  Please make sure ANTHROPIC_API_KEY is set in your .env file or provided via API keys.")
-        return ChatAnthropic(
-            model_name=model_name,
-            api_key=SecretStr(api_key),
-        )
-    elif model_provider == ModelProvider.DEEPSEEK:
-        api_key = _get_api_key(api_keys, "DEEPSEEK_API_KEY", provider_value)
-        if not api_key:
-            print(f"API Key Error: Please make sure DEEPSEEK_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("DeepSeek API key not found.  Please make sure DEEPSEEK_API_KEY is set in your .env file or provided via API keys.")
-        return ChatDeepSeek(model=model_name, api_key=SecretStr(api_key))
-    elif model_provider == ModelProvider.GOOGLE:
-        api_key = _get_api_key(api_keys, "GOOGLE_API_KEY", provider_value)
-        if not api_key:
-            print(f"API Key Error: Please make sure GOOGLE_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("Google API key not found.  Please make sure GOOGLE_API_KEY is set in your .env file or provided via API keys.")
-        return ChatGoogleGenerativeAI(
-            model=model_name,
-            api_key=SecretStr(api_key),
-        )
     elif model_provider == ModelProvider.OLLAMA:
         # For Ollama, we use a base URL instead of an API key
         # Check if OLLAMA_HOST is set (for Docker on macOS)
-        ollama_host = os.getenv("OLLAMA_HOST", "localhost")
-        base_url = os.getenv("OLLAMA_BASE_URL", f"http://{ollama_host}:11434")
+        ollama_host = _env("OLLAMA_HOST", "localhost")
+        base_url = _env("OLLAMA_BASE_URL", f"http://{ollama_host}:11434")
+        from langchain_ollama import ChatOllama
         return ChatOllama(
             model=model_name,
             base_url=base_url,
         )
-    elif model_provider == ModelProvider.OPENROUTER:
-        api_key = _get_api_key(api_keys, "OPENROUTER_API_KEY", provider_value)
-        if not api_key:
-            print(f"API Key Error: Please make sure OPENROUTER_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("OpenRouter API key not found. Please make sure OPENROUTER_API_KEY is set in your .env file or provided via API keys.")
-        
-        # Get optional site URL and name for headers
-        site_url = os.getenv("YOUR_SITE_URL", "https://github.com/virattt/ai-hedge-fund")
-        site_name = os.getenv("YOUR_SITE_NAME", "AI Hedge Fund")
-        
-        return ChatOpenAI(
-            model=model_name,
-            api_key=SecretStr(api_key),
-            base_url="https://openrouter.ai/api/v1",
-            model_kwargs={
-                "extra_headers": {
-                    "HTTP-Referer": site_url,
-                    "X-Title": site_name,
-                },
-            },
-        )
-    elif model_provider == ModelProvider.XAI:
-        api_key = _get_api_key(api_keys, "XAI_API_KEY", provider_value)
-        if not api_key:
-            print(f"API Key Error: Please make sure XAI_API_KEY is set in your .env file or provided via API keys.")
-            raise ValueError("xAI API key not found. Please make sure XAI_API_KEY is set in your .env file or provided via API keys.")
-        return ChatXAI(model=model_name, api_key=SecretStr(api_key))
     elif model_provider == ModelProvider.GIGACHAT:
-        if os.getenv("GIGACHAT_USER") or os.getenv("GIGACHAT_PASSWORD"):
+        from langchain_gigachat import GigaChat
+
+        if _env("GIGACHAT_USER") or _env("GIGACHAT_PASSWORD"):
             return GigaChat(model=model_name)
         else: 
-            api_key = _get_api_key(api_keys, "GIGACHAT_API_KEY", provider_value) or os.getenv("GIGACHAT_CREDENTIALS")
+            api_key = _get_api_key(api_keys, "GIGACHAT_API_KEY", model_provider) or _env("GIGACHAT_CREDENTIALS")
             if not api_key:
                 print("API Key Error: Please make sure api_keys is set in your .env file or provided via API keys.")
                 raise ValueError("GigaChat API key not found. Please make sure GIGACHAT_API_KEY is set in your .env file or provided via API keys.")
@@ -331,23 +417,24 @@ def get_model(
             return GigaChat(credentials=api_key, model=model_name)
     elif model_provider == ModelProvider.AZURE_OPENAI:
         # Get and validate API key
-        api_key = os.getenv("AZURE_OPENAI_API_KEY")
+        api_key = _env("AZURE_OPENAI_API_KEY")
         if not api_key:
             # Print error to console
             print(f"API Key Error: Please make sure AZURE_OPENAI_API_KEY is set in your .env file.")
             raise ValueError("Azure OpenAI API key not found.  Please make sure AZURE_OPENAI_API_KEY is set in your .env file.")
         # Get and validate Azure Endpoint
-        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+        azure_endpoint = _env("AZURE_OPENAI_ENDPOINT")
         if not azure_endpoint:
             # Print error to console
             print(f"Azure Endpoint Error: Please make sure AZURE_OPENAI_ENDPOINT is set in your .env file.")
             raise ValueError("Azure OpenAI endpoint not found.  Please make sure AZURE_OPENAI_ENDPOINT is set in your .env file.")
         # get and validate deployment name
-        azure_deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+        azure_deployment_name = _env("AZURE_OPENAI_DEPLOYMENT_NAME")
         if not azure_deployment_name:
             # Print error to console
             print(f"Azure Deployment Name Error: Please make sure AZURE_OPENAI_DEPLOYMENT_NAME is set in your .env file.")
             raise ValueError("Azure OpenAI deployment name not found.  Please make sure AZURE_OPENAI_DEPLOYMENT_NAME is set in your .env file.")
+        from langchain_openai import AzureChatOpenAI
         return AzureChatOpenAI(
             azure_endpoint=azure_endpoint,
             azure_deployment=azure_deployment_name,
@@ -1,4 +1,6 @@
+import os
 import sys
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
@@ -8,14 +10,15 @@ import questionary
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
-from src.utils.display import print_trading_output
+from src.utils.display import print_cascade_summary, print_trading_output
 from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
 from src.utils.progress import progress
 from src.utils.visualize import save_graph_as_png
 from src.utils.langfuse_callback import get_langfuse_callbacks
-from src.utils.langsmith_tracing import langsmith_flush
+from src.utils.langsmith_tracing import langsmith_flush, reset_langsmith_flush_ctx
+from src.utils.llm import start_prompt_cache_warmup, warm_prompt_names
 from src.utils.report import generate_final_report
-from src.utils.company_context import build_company_context
+from src.utils.company_context import build_company_context, company_context_scope
 from src.cli.input import (
     parse_cli_inputs,
 )
@@ -25,6 +28,11 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _json_loads = json.loads
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -34,8 +42,8 @@ init(autoreset=True)
 def parse_hedge_fund_response(response):
     """Parses a JSON string and returns a dictionary."""
     try:
-        return json.loads(response)
-    except json.JSONDecodeError as e:
+        return _json_loads(response)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
         print(f"JSON decoding error: {e}\nResponse: {repr(response)}")
         return None
     except TypeError as e:
@@ -66,58 +74,73 @@ def run_hedge_fund(
     selected_analysts: list[str] = [],
     model_name: str = "gpt-4.1",
     model_provider: str = "OpenAI",
+    generate_report: bool = True,
 ):
+    # Intern tickers/provider: they key portfolio, company_context and every analyst's signals
+    tickers = [sys.intern(t) for t in tickers]
+    if model_provider:
+        model_provider = sys.intern(str(model_provider))
+
     # Start progress tracking
     progress.start()
+    # Backtests call this repeatedly in one thread; let each run's langsmith_flush() take effect
+    reset_langsmith_flush_ctx()
 
     try:
-        # Build workflow (default to all analysts when none provided)
-        workflow = create_workflow(selected_analysts if selected_analysts else None)
-        agent = workflow.compile()
+        # Build workflow (default to all analysts when none provided); compiled once per analyst set
+        agent = _compiled_workflow(tuple(sorted(selected_analysts)) if selected_analysts else None)
 
         callbacks = get_langfuse_callbacks(tags=["hedge-fund", "cli"])
-        config = {"callbacks": callbacks} if callbacks else {}
+        # Analysts share one superstep; size the executor so all of them run concurrently
+        # (LangGraph's default pool is min(32, cpu_count + 4) threads)
+        analyst_count = len(selected_analysts) if selected_analysts else len(ANALYST_ORDER)
+        config = {"max_concurrency": max(analyst_count, 1)}
+        if callbacks:
+            config["callbacks"] = callbacks
         company_context = build_company_context(tickers, api_key=None)
-        company_lines = []
-        for t in tickers:
-            ctx = company_context.get(t, {})
-            name = ctx.get("name") or t
-            sector = ctx.get("sector") or "—"
-            industry = ctx.get("industry") or "—"
-            company_lines.append(f"  • {t}: {name} (Sector: {sector}, Industry: {industry})")
-        companies_summary = "\n".join(company_lines) if company_lines else "  (no company details)"
+        if os.getenv("HEDGEFUND_WARM_PROMPT_CACHE") == "1":
+            analysts = selected_analysts or [key for _, key in ANALYST_ORDER]
+            start_prompt_cache_warmup(model_name, model_provider, warm_prompt_names(analysts))
+        def _line(t: str) -> str:
+            # Fields may be present but None (CompanyFacts optionals), so `or` defaults, not get(k, default)
+            ctx = company_context.get(t) or {}
+            return f"  • {t}: {ctx.get('name') or t} (Sector: {ctx.get('sector') or '—'}, Industry: {ctx.get('industry') or '—'})"
+
+        companies_summary = "\n".join(_line(t) for t in tickers) or "  (no company details)"
         initial_content = (
             "Make trading decisions based on the provided data.\n\n"
             "Companies under analysis:\n" + companies_summary
         )
-        final_state = agent.invoke(
-            {
-                "messages": [
-                    HumanMessage(content=initial_content),
-                ],
-                "data": {
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "analyst_signals": {},
-                    "company_context": company_context,
+        # company_context is served to agents via a context var rather than graph state
+        with company_context_scope(company_context):
+            final_state = agent.invoke(
+                {
+                    "messages": [
+                        HumanMessage(content=initial_content),
+                    ],
+                    "data": {
+                        "tickers": tickers,
+                        "portfolio": portfolio,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "analyst_signals": {},
+                    },
+                    "metadata": {
+                        "show_reasoning": show_reasoning,
+                        "model_name": model_name,
+                        "model_provider": model_provider,
+                    },
                 },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
-            },
-            config=config,
-        )
+                config=config,
+            )
         langsmith_flush()
         last_content = final_state["messages"][-1].content
         decisions, report = parse_portfolio_manager_content(last_content)
         decisions = decisions or {}
         analyst_signals = final_state["data"]["analyst_signals"]
         current_prices = final_state["data"].get("current_prices", {})
-        if not (report and report.strip()):
+        # The portfolio manager only decides; the Markdown report is one extra call, skipped when not wanted
+        if generate_report and not (report and report.strip()):
             report = generate_final_report(
                 decisions=decisions,
                 analyst_signals=analyst_signals,
@@ -160,10 +183,12 @@ def create_workflow(selected_analysts=None):
     workflow.add_node("risk_management_agent", risk_management_agent)
     workflow.add_node("portfolio_manager", portfolio_management_agent)
 
-    # Connect selected analysts to risk management
-    for analyst_key in selected_analysts:
-        node_name = analyst_nodes[analyst_key][0]
-        workflow.add_edge(node_name, "risk_management_agent")
+    # Fan-in: risk management waits for every selected analyst (analysts run in parallel)
+    analyst_node_names = [analyst_nodes[analyst_key][0] for analyst_key in selected_analysts]
+    if analyst_node_names:
+        workflow.add_edge(analyst_node_names, "risk_management_agent")
+    else:
+        workflow.add_edge("start_node", "risk_management_agent")
 
     workflow.add_edge("risk_management_agent", "portfolio_manager")
     workflow.add_edge("portfolio_manager", END)
@@ -172,6 +197,12 @@ def create_workflow(selected_analysts=None):
     return workflow
 
 
+@lru_cache(maxsize=8)
+def _compiled_workflow(analysts_key: tuple[str, ...] | None):
+    """Compiled graph for the given analyst set, reused across runs (e.g. each backtest day)."""
+    return create_workflow(list(analysts_key) if analysts_key else None).compile()
+
+
 if __name__ == "__main__":
     inputs = parse_cli_inputs(
         description="Run the hedge fund trading system",
@@ -181,7 +212,7 @@ if __name__ == "__main__":
         include_reasoning_flag=True,
     )
 
-    tickers = inputs.tickers
+    tickers = [sys.intern(t) for t in inputs.tickers]
     selected_analysts = inputs.selected_analysts
 
     # Construct portfolio here
@@ -219,3 +250,4 @@ if __name__ == "__main__":
         model_provider=inputs.model_provider,
     )
     print_trading_output(result)
+    print_cascade_summary()
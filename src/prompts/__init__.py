@@ -3,7 +3,15 @@ Centralized prompt definitions and loader.
 Defaults live in the registry; at runtime prompts are loaded from Langfuse when configured,
 otherwise from the local registry.
 """
-from src.prompts.loader import get_prompt_template
-from src.prompts.registry import PROMPT_NAMES
+from src.prompts.loader import get_prompt_template, log_render_vars, render_batched, render_prompt
+from src.prompts.registry import PROMPT_NAMES, PROMPT_VARS, validate_render_inputs
 
-__all__ = ["get_prompt_template", "PROMPT_NAMES"]
+__all__ = [
+    "get_prompt_template",
+    "render_prompt",
+    "render_batched",
+    "log_render_vars",
+    "PROMPT_NAMES",
+    "PROMPT_VARS",
+    "validate_render_inputs",
+]
@@ -0,0 +1,95 @@
+"""
+On-disk completion cache for LLM calls, keyed by the fully rendered prompt.
+Backtests and re-runs issue the same (persona, ticker, facts) prompt many times; with the
+cache enabled (HEDGEFUND_LLM_CACHE=1) repeated prompts are answered from SQLite instead of
+the provider. Layout mirrors langchain's SQLiteCache: (key, response, created_at).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-hedge-fund" / "llm_cache.sqlite"
+)
+DEFAULT_TTL_SEC = 7 * 86400
+
+
+def completion_cache_key(messages: Iterable[tuple[str, str]], *scope: str) -> str:
+    """Deterministic key over ordered (role, content) pairs plus scope (model, provider, schema)."""
+    payload = orjson.dumps([list(scope), [list(m) for m in messages]])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class PromptCompletionCache:
+    """SQLite-backed key -> response store with a TTL; safe to share across analyst threads."""
+
+    def __init__(self, path: Path | str = DEFAULT_CACHE_PATH, ttl_sec: int = DEFAULT_TTL_SEC):
+        self.path = Path(path)
+        self.ttl_sec = ttl_sec
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL: readers in other processes (parallel backtests) don't block on a writer
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+
+    def get(self, key: str) -> str | None:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("LLM cache read failed: %s", e)
+            return None
+        if row is None or time.time() - row[1] >= self.ttl_sec:
+            return None
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store response; write errors (locked DB, full disk) are logged, never raised."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, int(time.time())),
+                )
+        except sqlite3.Error as e:
+            logger.debug("LLM cache write failed: %s", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+
+
+@lru_cache(maxsize=1)
+def get_completion_cache() -> PromptCompletionCache | None:
+    """
+    Process-wide cache when HEDGEFUND_LLM_CACHE=1, else None. Resolved on first use (after
+    load_dotenv); HEDGEFUND_LLM_CACHE_PATH / HEDGEFUND_LLM_CACHE_TTL override the defaults.
+    """
+    if os.getenv("HEDGEFUND_LLM_CACHE", "0") != "1":
+        return None
+    try:
+        return PromptCompletionCache(
+            os.getenv("HEDGEFUND_LLM_CACHE_PATH") or DEFAULT_CACHE_PATH,
+            int(os.getenv("HEDGEFUND_LLM_CACHE_TTL") or DEFAULT_TTL_SEC),
+        )
+    except Exception as e:
+        logger.warning("LLM completion cache unavailable, calling the model directly: %s", e)
+        return None
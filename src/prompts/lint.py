@@ -0,0 +1,41 @@
+"""
+Prompt lint: flag instruction lines in registry prompts that encode deterministic rules
+(thresholds, boolean combinations of metrics). Such rules are cheaper and more reliable
+computed in Python with only the result passed to the model (see apply_buffett_rules).
+tests/test_prompt_lint.py keeps the shipped prompts clean; exits non-zero when anything is flagged:
+
+    uv run python -m src.prompts.lint
+"""
+from __future__ import annotations
+
+import re
+import sys
+from typing import Mapping, Sequence
+
+from src.prompts.registry import DEFAULT_PROMPTS
+
+# metric_name > 0, ratio <= 1.5, "X AND Y" / "X OR Y" between conditions
+_DETERMINISTIC_PATTERNS = (
+    re.compile(r"\b[a-z_]+\s*(?:>=|<=|>|<|==)\s*-?\d"),
+    re.compile(r"\b(?:AND|OR)\b"),
+)
+
+
+def simplify_deterministic(
+    prompts: Mapping[str, Sequence[Mapping[str, str]]] = DEFAULT_PROMPTS,
+) -> list[tuple[str, str, str]]:
+    """Return (prompt name, role, line) for every line that looks like a deterministic rule."""
+    flagged = []
+    for name, messages in prompts.items():
+        for m in messages:
+            for line in m["content"].splitlines():
+                if any(p.search(line) for p in _DETERMINISTIC_PATTERNS):
+                    flagged.append((name, m["role"], line.strip()))
+    return flagged
+
+
+if __name__ == "__main__":
+    flagged = simplify_deterministic()
+    for name, role, line in flagged:
+        print(f"{name} [{role}]: {line}")
+    sys.exit(1 if flagged else 0)
@@ -1,20 +1,39 @@
 """
 Load prompt template by name: from Langfuse when configured, else from local registry.
-Returns a LangChain ChatPromptTemplate; callers invoke it with their variables and pass
-the result to call_llm(prompt=..., ...).
+Agents call render_prompt(name, variables) and pass the result to call_llm(prompt=..., ...);
+registry prompts render through their precompiled templates, Langfuse ones through ChatPromptTemplate.
 """
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any
+import os
+import time
+from functools import lru_cache
+from typing import Any, Mapping
 
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 
-from src.prompts.registry import get_default_messages
+from src.prompts.registry import (
+    BATCH_TOKEN_BUDGET,
+    COMPRESSED_PROMPTS,
+    PROMPT_NAMES,
+    PROMPT_VARS,
+    CompiledMessages,
+    get_compiled_messages,
+    get_default_messages,
+    validate_render_inputs,
+)
 from src.utils.langfuse_callback import is_langfuse_configured
 
 logger = logging.getLogger(__name__)
 
+# (name, label) -> (fetched_at, template); avoids a Langfuse round-trip per agent call
+_PROMPT_TTL_SEC = 300
+_PROMPT_CACHE: dict[tuple[str, str], tuple[float, ChatPromptTemplate]] = {}
+
 
 def get_prompt_template(
     name: str,
@@ -26,7 +45,9 @@ def get_prompt_template(
 
     When Langfuse is configured (LANGFUSE_PUBLIC_KEY + LANGFUSE_SECRET_KEY), fetches
     the prompt from Langfuse (type=chat, with optional label/version). On missing
-    config or any error, falls back to the local registry default.
+    config or any error, falls back to the local registry default (the LLMLingua-compressed
+    version when HEDGEFUND_COMPRESSED_PROMPTS=1 and one exists). Results are cached
+    in-process for _PROMPT_TTL_SEC per (name, label).
 
     Args:
         name: Prompt name (e.g. "hedge-fund/ben_graham"), must match registry and Langfuse.
@@ -34,10 +55,20 @@ def get_prompt_template(
         **compile_kwargs: Unused; reserved for future use (e.g. pre-invoke).
 
     Returns:
-        ChatPromptTemplate. Call template.invoke({...}) with your variables, then pass
-        the result to call_llm(prompt=..., ...).
+        ChatPromptTemplate. Agents use render_prompt(name, {...}) instead, which renders
+        registry prompts without going through the template.
     """
     _ = compile_kwargs  # reserved
+    key = (name, label)
+    cached = _PROMPT_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _PROMPT_TTL_SEC:
+        return cached[1]
+    template = _load_prompt_template(name, label)
+    _PROMPT_CACHE[key] = (time.monotonic(), template)
+    return template
+
+
+def _load_prompt_template(name: str, label: str) -> ChatPromptTemplate:
     if is_langfuse_configured():
         try:
             from langfuse import get_client
@@ -47,13 +78,99 @@ def get_prompt_template(
             lc_prompt = pf.get_langchain_prompt()
             # get_langchain_prompt() for chat returns a list of message-like items
             if isinstance(lc_prompt, list):
-                return ChatPromptTemplate.from_messages(lc_prompt)
-            return ChatPromptTemplate.from_template(lc_prompt)
+                template = ChatPromptTemplate.from_messages(lc_prompt)
+            else:
+                template = ChatPromptTemplate.from_template(lc_prompt)
+            # Agents only pass the registry's variables; a Langfuse edit needing others would
+            # fail at invoke time, after all the agent's data fetching, so reject it here
+            extra = set(template.input_variables) - PROMPT_VARS.get(name, frozenset())
+            if not extra:
+                return template
+            logger.warning("Langfuse prompt %s needs unknown variables %s, using registry", name, sorted(extra))
         except Exception as e:
             logger.debug("Langfuse get_prompt failed, using registry: %s", e)
 
-    messages = get_default_messages(name)
+    return _compile_registry_template(name, _use_compressed_prompts() and name in COMPRESSED_PROMPTS)
+
+
+_MESSAGE_TYPES = {"system": SystemMessage, "human": HumanMessage}
+
+
+def render_prompt(name: str, variables: Mapping[str, Any], label: str = "production") -> ChatPromptValue:
+    """
+    Render prompt name with variables, ready for call_llm(prompt=..., ...).
+
+    Registry prompts (Langfuse unset, failing, or serving an incompatible version) are rendered
+    by the templates the registry compiled at import, skipping ChatPromptTemplate's per-call
+    parsing and validation; Langfuse prompts go through template.invoke as before. Raises
+    KeyError before loading or rendering anything if variables misses one of PROMPT_VARS[name],
+    so a caller bug surfaces here rather than as a failed (and billed) LLM call.
+    """
+    validate_render_inputs(name, variables)
+    template = get_prompt_template(name, label)
+    compressed = _use_compressed_prompts() and name in COMPRESSED_PROMPTS
+    if template is not _compile_registry_template(name, compressed):
+        return template.invoke(dict(variables))
+    return _prompt_value(get_compiled_messages(name, compressed), variables)
+
+
+def render_batched(
+    name: str,
+    per_ticker: Mapping[str, Any],
+    token_budget: int = BATCH_TOKEN_BUDGET,
+) -> list[tuple[list[str], ChatPromptValue]]:
+    """
+    Render the batched variant of persona prompt name for per_ticker (ticker -> analysis data):
+    one (tickers, prompt) per shard, so N tickers cost one call instead of N. Tickers are packed
+    in order until the shard's estimated tokens (chars / 4) would exceed token_budget; a single
+    oversized ticker still gets its own shard. Always the registry text: batched variants are
+    derived from the local defaults and are not synced to Langfuse.
+    """
+    compiled = get_compiled_messages(name, batch=True)
+    overhead = sum(len(render({"ticker_analysis_bundle": ""})) for _, render in compiled) // 4
+    shards: list[dict[str, Any]] = []
+    used = overhead
+    for ticker, data in per_ticker.items():
+        cost = len(json.dumps({ticker: data}, indent=2, default=str)) // 4
+        if shards and used + cost <= token_budget:
+            shards[-1][ticker] = data
+        else:
+            shards.append({ticker: data})
+            used = overhead
+        used += cost
+    return [
+        (list(shard), _prompt_value(compiled, {"ticker_analysis_bundle": json.dumps(shard, indent=2, default=str)}))
+        for shard in shards
+    ]
+
+
+def _prompt_value(compiled: CompiledMessages, variables: Mapping[str, Any]) -> ChatPromptValue:
+    return ChatPromptValue(messages=[_MESSAGE_TYPES[role](content=render(variables)) for role, render in compiled])
+
+
+@lru_cache(maxsize=1)
+def _use_compressed_prompts() -> bool:
+    """HEDGEFUND_COMPRESSED_PROMPTS=1: serve scripts/compress_prompts.py output; read on first use, after load_dotenv."""
+    return os.getenv("HEDGEFUND_COMPRESSED_PROMPTS", "0") == "1"
+
+
+@lru_cache(maxsize=64)
+def _compile_registry_template(name: str, compressed: bool = False) -> ChatPromptTemplate:
+    """Build the registry default for name once; the registry is static for the process lifetime."""
+    messages = get_default_messages(name, compressed=compressed)
     # LangChain from_messages accepts list of (role, content) where content may have {vars}
     return ChatPromptTemplate.from_messages(
         [(m["role"], m["content"]) for m in messages]
     )
+
+
+def log_render_vars() -> None:
+    """Log every prompt's required render variables; called once at startup."""
+    for name in PROMPT_NAMES:
+        logger.info("Prompt %s render vars: %s", name, ", ".join(sorted(PROMPT_VARS[name])))
+
+
+# Registry is small (one entry per agent): compile every default up front
+for _name in PROMPT_NAMES:
+    _compile_registry_template(_name, False)
+del _name
@@ -1,11 +1,19 @@
 """
 Local default prompts for all analyst agents and portfolio manager.
-Names match Langfuse prompt names (e.g. hedge-fund/ben_graham).
+Names match Langfuse prompt names (e.g. hedge-fund/ben_graham); the text of each message is
+stored in data/<prompt>.<role>.md.
 Variable placeholders use LangChain style {variable} in content.
 """
 from __future__ import annotations
 
-# Prompt name constants for use with get_prompt_template()
+import json
+import string
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping
+
+# Prompt name constants for use with render_prompt() / get_prompt_template()
 PROMPT_NAMES = (
     "hedge-fund/ben_graham",
     "hedge-fund/bill_ackman",
@@ -19,524 +27,249 @@ PROMPT_NAMES = (
     "hedge-fund/rakesh_jhunjhunwala",
     "hedge-fund/stanley_druckenmiller",
     "hedge-fund/warren_buffett",
-    "hedge-fund/portfolio_manager",
+    "hedge-fund/portfolio_manager__decisions",
     "hedge-fund/final_report",
+    "hedge-fund/final_report__stream",
 )
 
-# Default chat messages: list of {"role": "system"|"human", "content": "..."}
-# Placeholders in content use {variable} (LangChain style).
-DEFAULT_PROMPTS: dict[str, list[dict[str, str]]] = {
-    "hedge-fund/ben_graham": [
-        {
-            "role": "system",
-            "content": """You are a Benjamin Graham AI agent, making investment decisions using his principles:
-            1. Insist on a margin of safety by buying below intrinsic value (e.g., using Graham Number, net-net).
-            2. Emphasize the company's financial strength (low leverage, ample current assets).
-            3. Prefer stable earnings over multiple years.
-            4. Consider dividend record for extra safety.
-            5. Avoid speculative or high-growth assumptions; focus on proven metrics.
-            
-            When providing your reasoning, be thorough and specific by:
-            1. Explaining the key valuation metrics that influenced your decision the most (Graham Number, NCAV, P/E, etc.)
-            2. Highlighting the specific financial strength indicators (current ratio, debt levels, etc.)
-            3. Referencing the stability or instability of earnings over time
-            4. Providing quantitative evidence with precise numbers
-            5. Comparing current metrics to Graham's specific thresholds (e.g., "Current ratio of 2.5 exceeds Graham's minimum of 2.0")
-            6. Using Benjamin Graham's conservative, analytical voice and style in your explanation
-            
-            For example, if bullish: "The stock trades at a 35% discount to net current asset value, providing an ample margin of safety. The current ratio of 2.5 and debt-to-equity of 0.3 indicate strong financial position..."
-            For example, if bearish: "Despite consistent earnings, the current price of $50 exceeds our calculated Graham Number of $35, offering no margin of safety. Additionally, the current ratio of only 1.2 falls below Graham's preferred 2.0 threshold..."
-                        
-            Return a rational recommendation: bullish, bearish, or neutral, with a confidence level (0-100) and thorough reasoning.
-            """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis, create a Graham-style investment signal:
-
-            Analysis Data for {ticker}:
-            {analysis_data}
-
-            Return JSON exactly in this format:
-            {{
-              "signal": "bullish" or "bearish" or "neutral",
-              "confidence": float (0-100),
-              "reasoning": "string"
-            }}
-            """,
-        },
-    ],
-    "hedge-fund/warren_buffett": [
-        {
-            "role": "system",
-            "content": """You are Warren Buffett. Decide bullish, bearish, or neutral using only the provided facts.
-
-            Checklist for decision:
-            - Circle of competence
-            - Competitive moat
-            - Management quality
-            - Financial strength
-            - Valuation vs intrinsic value
-            - Long-term prospects
-
-            Signal rules:
-            - Bullish: strong business AND margin_of_safety > 0.
-            - Bearish: poor business OR clearly overvalued.
-            - Neutral: good business but margin_of_safety <= 0, or mixed evidence.
-
-            Confidence scale:
-            - 90-100%: Exceptional business within my circle, trading at attractive price
-            - 70-89%: Good business with decent moat, fair valuation
-            - 50-69%: Mixed signals, would need more information or better price
-            - 30-49%: Outside my expertise or concerning fundamentals
-            - 10-29%: Poor business or significantly overvalued
-
-            Keep reasoning under 120 characters. Do not invent data. Return JSON only.""",
-        },
-        {
-            "role": "human",
-            "content": """Ticker: {ticker}
-            {company_context_block}
-            Facts:
-            {facts}
-
-            Return exactly:
-            {{
-              "signal": "bullish" | "bearish" | "neutral",
-              "confidence": int,
-              "reasoning": "short justification"
-            }}""",
-        },
-    ],
-    "hedge-fund/charlie_munger": [
-        {
-            "role": "system",
-            "content": """You are Charlie Munger. Decide bullish, bearish, or neutral using only the facts. """
-            """Return JSON only. Keep reasoning under 120 characters. """
-            """Use the provided confidence exactly; do not change it.""",
-        },
-        {
-            "role": "human",
-            "content": """Ticker: {ticker}
-            Facts:
-            {facts}
-
-            Confidence: {confidence}
-
-            Return exactly:
-            {{
-              "signal": "bullish" | "bearish" | "neutral",
-              "confidence": {confidence},
-              "reasoning": "short justification"
-            }}""",
-        },
-    ],
-    "hedge-fund/portfolio_manager": [
-        {
-            "role": "system",
-            "content": """You are a portfolio manager and report writer.
-            1) Inputs per ticker: analyst signals and allowed actions with max qty (already validated).
-               Pick one allowed action per ticker and a quantity ≤ the max. Keep reasoning very concise (max 100 chars). No cash or margin math.
-            2) Then write a Chinese Markdown report (深度研报) with: 摘要、各标的/分析师观点汇总、综合结论与操作建议. Use the signals and your decisions as basis. Be professional and concise.
-            Return JSON only, with two keys: "decisions" (as below) and "report" (string: full Markdown report).""",
-        },
-        {
-            "role": "human",
-            "content": """Signals:
-            {signals}
-
-            Allowed:
-            {allowed}
-
-            Return exactly this JSON (decisions + report):
-            {{
-              "decisions": {{
-                "TICKER": {{"action":"buy|sell|short|cover|hold","quantity":int,"confidence":int,"reasoning":"..."}}
-              }},
-              "report": "完整研报正文，Markdown 格式，包含：摘要、各标的/分析师观点汇总、综合结论与操作建议"
-            }}""",
-        },
-    ],
-    "hedge-fund/bill_ackman": [
-        {
-            "role": "system",
-            "content": """You are a Bill Ackman AI agent, making investment decisions using his principles:
-
-            1. Seek high-quality businesses with durable competitive advantages (moats), often in well-known consumer or service brands.
-            2. Prioritize consistent free cash flow and growth potential over the long term.
-            3. Advocate for strong financial discipline (reasonable leverage, efficient capital allocation).
-            4. Valuation matters: target intrinsic value with a margin of safety.
-            5. Consider activism where management or operational improvements can unlock substantial upside.
-            6. Concentrate on a few high-conviction investments.
-
-            In your reasoning:
-            - Emphasize brand strength, moat, or unique market positioning.
-            - Review free cash flow generation and margin trends as key signals.
-            - Analyze leverage, share buybacks, and dividends as capital discipline metrics.
-            - Provide a valuation assessment with numerical backup (DCF, multiples, etc.).
-            - Identify any catalysts for activism or value creation (e.g., cost cuts, better capital allocation).
-            - Use a confident, analytic, and sometimes confrontational tone when discussing weaknesses or opportunities.
-
-            Return your final recommendation (signal: bullish, neutral, or bearish) with a 0-100 confidence and a thorough reasoning section.
-            """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis, create an Ackman-style investment signal.
-
-            Analysis Data for {ticker}:
-            {analysis_data}
-
-            Return your output in strictly valid JSON:
-            {{
-              "signal": "bullish" | "bearish" | "neutral",
-              "confidence": float (0-100),
-              "reasoning": "string"
-            }}
-            """,
-        },
-    ],
-    "hedge-fund/aswath_damodaran": [
-        {
-            "role": "system",
-            "content": """You are Aswath Damodaran, Professor of Finance at NYU Stern.
-            Use your valuation framework to issue trading signals on US equities.
-
-            Speak with your usual clear, data-driven tone:
-              ◦ Start with the company "story" (qualitatively)
-              ◦ Connect that story to key numerical drivers: revenue growth, margins, reinvestment, risk
-              ◦ Conclude with value: your FCFF DCF estimate, margin of safety, and relative valuation sanity checks
-              ◦ Highlight major uncertainties and how they affect value
-            Return ONLY the JSON specified below.""",
-        },
-        {
-            "role": "human",
-            "content": """Ticker: {ticker}
-
-            Analysis data:
-            {analysis_data}
-
-            Respond EXACTLY in this JSON schema:
-            {{
-              "signal": "bullish" | "bearish" | "neutral",
-              "confidence": float (0-100),
-              "reasoning": "string"
-            }}""",
-        },
-    ],
-    "hedge-fund/cathie_wood": [
-        {
-            "role": "system",
-            "content": """You are a Cathie Wood AI agent, making investment decisions using her principles:
-
-            1. Seek companies leveraging disruptive innovation.
-            2. Emphasize exponential growth potential, large TAM.
-            3. Focus on technology, healthcare, or other future-facing sectors.
-            4. Consider multi-year time horizons for potential breakthroughs.
-            5. Accept higher volatility in pursuit of high returns.
-            6. Evaluate management's vision and ability to invest in R&D.
-
-            Rules:
-            - Identify disruptive or breakthrough technology.
-            - Evaluate strong potential for multi-year revenue growth.
-            - Check if the company can scale effectively in a large market.
-            - Use a growth-biased valuation approach.
-            - Provide a data-driven recommendation (bullish, bearish, or neutral).
-            
-            When providing your reasoning, be thorough and specific by:
-            1. Identifying the specific disruptive technologies/innovations the company is leveraging
-            2. Highlighting growth metrics that indicate exponential potential (revenue acceleration, expanding TAM)
-            3. Discussing the long-term vision and transformative potential over 5+ year horizons
-            4. Explaining how the company might disrupt traditional industries or create new markets
-            5. Addressing R&D investment and innovation pipeline that could drive future growth
-            6. Using Cathie Wood's optimistic, future-focused, and conviction-driven voice
-            
-            For example, if bullish: "The company's AI-driven platform is transforming the $500B healthcare analytics market, with evidence of platform adoption accelerating from 40% to 65% YoY. Their R&D investments of 22% of revenue are creating a technological moat that positions them to capture a significant share of this expanding market. The current valuation doesn't reflect the exponential growth trajectory we expect as..."
-            For example, if bearish: "While operating in the genomics space, the company lacks truly disruptive technology and is merely incrementally improving existing techniques. R&D spending at only 8% of revenue signals insufficient investment in breakthrough innovation. With revenue growth slowing from 45% to 20% YoY, there's limited evidence of the exponential adoption curve we look for in transformative companies..."
-            """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis, create a Cathie Wood-style investment signal.
-
-            Analysis Data for {ticker}:
-            {analysis_data}
-
-            Return the trading signal in this JSON format:
-            {{
-              "signal": "bullish/bearish/neutral",
-              "confidence": float (0-100),
-              "reasoning": "string"
-            }}
-            """,
-        },
-    ],
-    "hedge-fund/michael_burry": [
-        {
-            "role": "system",
-            "content": """You are an AI agent emulating Dr. Michael J. Burry. Your mandate:
-            - Hunt for deep value in US equities using hard numbers (free cash flow, EV/EBIT, balance sheet)
-            - Be contrarian: hatred in the press can be your friend if fundamentals are solid
-            - Focus on downside first – avoid leveraged balance sheets
-            - Look for hard catalysts such as insider buying, buybacks, or asset sales
-            - Communicate in Burry's terse, data‑driven style
-
-            When providing your reasoning, be thorough and specific by:
-            1. Start with the key metric(s) that drove your decision
-            2. Cite concrete numbers (e.g. "FCF yield 14.7%", "EV/EBIT 5.3")
-            3. Highlight risk factors and why they are acceptable (or not)
-            4. Mention relevant insider activity or contrarian opportunities
-            5. Use Burry's direct, number-focused communication style with minimal words
-            
-            For example, if bullish: "FCF yield 12.8%. EV/EBIT 6.2. Debt-to-equity 0.4. Net insider buying 25k shares. Market missing value due to overreaction to recent litigation. Strong buy."
-            For example, if bearish: "FCF yield only 2.1%. Debt-to-equity concerning at 2.3. Management diluting shareholders. Pass."
-            """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following data, create the investment signal as Michael Burry would:
-
-            Analysis Data for {ticker}:
-            {analysis_data}
-
-            Return the trading signal in the following JSON format exactly:
-            {{
-              "signal": "bullish" | "bearish" | "neutral",
-              "confidence": float between 0 and 100,
-              "reasoning": "string"
-            }}
-            """,
-        },
-    ],
-    "hedge-fund/mohnish_pabrai": [
-        {
-            "role": "system",
-            "content": """You are Mohnish Pabrai. Apply my value investing philosophy:
-
-          - Heads I win; tails I don't lose much: prioritize downside protection first.
-          - Buy businesses with simple, understandable models and durable moats.
-          - Demand high free cash flow yields and low leverage; prefer asset-light models.
-          - Look for situations where intrinsic value is rising and price is significantly lower.
-          - Favor cloning great investors' ideas and checklists over novelty.
-          - Seek potential to double capital in 2-3 years with low risk.
-          - Avoid leverage, complexity, and fragile balance sheets.
-
-            Provide candid, checklist-driven reasoning, with emphasis on capital preservation and expected mispricing.
-            """,
-        },
-        {
-            "role": "human",
-            "content": """Analyze {ticker} using the provided data.
-
-          DATA:
-          {analysis_data}
-
-          Return EXACTLY this JSON:
-          {{
-            "signal": "bullish" | "bearish" | "neutral",
-            "confidence": float (0-100),
-            "reasoning": "string with Pabrai-style analysis focusing on downside protection, FCF yield, and doubling potential"
-          }}
-          """,
-        },
-    ],
-    "hedge-fund/peter_lynch": [
-        {
-            "role": "system",
-            "content": """You are a Peter Lynch AI agent. You make investment decisions based on Peter Lynch's well-known principles:
-                
-                1. Invest in What You Know: Emphasize understandable businesses, possibly discovered in everyday life.
-                2. Growth at a Reasonable Price (GARP): Rely on the PEG ratio as a prime metric.
-                3. Look for 'Ten-Baggers': Companies capable of growing earnings and share price substantially.
-                4. Steady Growth: Prefer consistent revenue/earnings expansion, less concern about short-term noise.
-                5. Avoid High Debt: Watch for dangerous leverage.
-                6. Management & Story: A good 'story' behind the stock, but not overhyped or too complex.
-                
-                When you provide your reasoning, do it in Peter Lynch's voice:
-                - Cite the PEG ratio
-                - Mention 'ten-bagger' potential if applicable
-                - Refer to personal or anecdotal observations (e.g., "If my kids love the product...")
-                - Use practical, folksy language
-                - Provide key positives and negatives
-                - Conclude with a clear stance (bullish, bearish, or neutral)
-                
-                Return your final output strictly in JSON with the fields:
-                {{
-                  "signal": "bullish" | "bearish" | "neutral",
-                  "confidence": 0 to 100,
-                  "reasoning": "string"
-                }}
-                """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis data for {ticker}, produce your Peter Lynch–style investment signal.
+# Shared reply schema for persona signals; substituted for {signal_schema} at import, so every
+# persona ends its static system text with the same bytes (one cacheable suffix across personas).
+# int confidence: valid for both the int and the float persona reply models.
+SIGNAL_JSON_SCHEMA = """Return exactly this JSON (no other text):
+{{
+  "signal": "bullish" | "bearish" | "neutral",
+  "confidence": int (0-100),
+  "reasoning": "string"
+}}"""
+# Reply schema of the batched persona variants (see get_default_messages(name, batch=True))
+BATCHED_SIGNAL_JSON_SCHEMA = """Return exactly this JSON, with one entry per ticker (no other text):
+{{
+  "signals": {{
+    "TICKER": {{"signal": "bullish" | "bearish" | "neutral", "confidence": int (0-100), "reasoning": "string"}}
+  }}
+}}"""
+
+# Compact checklist codes; the legend is part of the static system prefix, prompts refer to codes
+CHECKLIST_CODES = {
+    "CoC": "Circle of competence",
+    "MOAT": "Competitive moat",
+    "MGMT": "Management quality",
+    "FIN": "Financial strength",
+    "VAL": "Valuation vs intrinsic value",
+    "LT": "Long-term prospects",
+}
+CHECKLIST_LEGEND = "Checklist (CHK): " + ", ".join(f"{code}={label}" for code, label in CHECKLIST_CODES.items())
+
+# Prompt text lives in data/<prompt>.<role>.md (plain text, reviewable diffs); {variable}
+# placeholders are LangChain style, {{ }} are literal braces, and {signal_schema} /
+# {checklist_legend} are substituted with the shared blocks above.
+# hedge-fund/portfolio_manager__decisions returns decisions only; the report is a separate
+# hedge-fund/final_report call (raw Markdown, streamed: hedge-fund/final_report__stream).
+PROMPT_DATA_DIR = Path(__file__).with_name("data")
+_ROLES = ("system", "human")
+
+
+def _load_content(name: str, role: str) -> str:
+    text = (PROMPT_DATA_DIR / f"{name.split('/', 1)[1]}.{role}.md").read_text(encoding="utf-8")
+    return (
+        text.rstrip("\n")
+        .replace("{signal_schema}", SIGNAL_JSON_SCHEMA)
+        .replace("{checklist_legend}", CHECKLIST_LEGEND)
+    )
+
+
+# Loaded once at import, so the static system text is byte-identical on every call and provider
+# prefix caches can hit. Frozen: callers share these objects, so lookups return them without copying.
+DEFAULT_PROMPTS: Mapping[str, tuple[Mapping[str, str], ...]] = MappingProxyType(
+    {
+        name: tuple(MappingProxyType({"role": role, "content": _load_content(name, role)}) for role in _ROLES)
+        for name in PROMPT_NAMES
+    }
+)
 
-                Analysis Data:
-                {analysis_data}
+# Anthropic-style prompt-cache breakpoint; call_llm marks each (static) system message with it
+PROMPT_CACHE_CONTROL = {"type": "ephemeral"}
 
-                Return only valid JSON with "signal", "confidence", and "reasoning".
-                """,
-        },
-    ],
-    "hedge-fund/phil_fisher": [
-        {
-            "role": "system",
-            "content": """You are a Phil Fisher AI agent, making investment decisions using his principles:
-  
-              1. Emphasize long-term growth potential and quality of management.
-              2. Focus on companies investing in R&D for future products/services.
-              3. Look for strong profitability and consistent margins.
-              4. Willing to pay more for exceptional companies but still mindful of valuation.
-              5. Rely on thorough research (scuttlebutt) and thorough fundamental checks.
-              
-              When providing your reasoning, be thorough and specific by:
-              1. Discussing the company's growth prospects in detail with specific metrics and trends
-              2. Evaluating management quality and their capital allocation decisions
-              3. Highlighting R&D investments and product pipeline that could drive future growth
-              4. Assessing consistency of margins and profitability metrics with precise numbers
-              5. Explaining competitive advantages that could sustain growth over 3-5+ years
-              6. Using Phil Fisher's methodical, growth-focused, and long-term oriented voice
-              
-              For example, if bullish: "This company exhibits the sustained growth characteristics we seek, with revenue increasing at 18% annually over five years. Management has demonstrated exceptional foresight by allocating 15% of revenue to R&D, which has produced three promising new product lines. The consistent operating margins of 22-24% indicate pricing power and operational efficiency that should continue to..."
-              
-              For example, if bearish: "Despite operating in a growing industry, management has failed to translate R&D investments (only 5% of revenue) into meaningful new products. Margins have fluctuated between 10-15%, showing inconsistent operational execution. The company faces increasing competition from three larger competitors with superior distribution networks. Given these concerns about long-term growth sustainability..."
-              
-              You must output a JSON object with:
-                - "signal": "bullish" or "bearish" or "neutral"
-                - "confidence": a float between 0 and 100
-                - "reasoning": a detailed explanation
-              """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis, create a Phil Fisher-style investment signal.
-
-              Analysis Data for {ticker}:
-              {analysis_data}
-
-              Return the trading signal in this JSON format:
-              {{
-                "signal": "bullish/bearish/neutral",
-                "confidence": float (0-100),
-                "reasoning": "string"
-              }}
-              """,
-        },
-    ],
-    "hedge-fund/rakesh_jhunjhunwala": [
-        {
-            "role": "system",
-            "content": """You are a Rakesh Jhunjhunwala AI agent. Decide on investment signals based on Rakesh Jhunjhunwala's principles:
-                - Circle of Competence: Only invest in businesses you understand
-                - Margin of Safety (> 30%): Buy at a significant discount to intrinsic value
-                - Economic Moat: Look for durable competitive advantages
-                - Quality Management: Seek conservative, shareholder-oriented teams
-                - Financial Strength: Favor low debt, strong returns on equity
-                - Long-term Horizon: Invest in businesses, not just stocks
-                - Growth Focus: Look for companies with consistent earnings and revenue growth
-                - Sell only if fundamentals deteriorate or valuation far exceeds intrinsic value
-
-                When providing your reasoning, be thorough and specific by:
-                1. Explaining the key factors that influenced your decision the most (both positive and negative)
-                2. Highlighting how the company aligns with or violates specific Jhunjhunwala principles
-                3. Providing quantitative evidence where relevant (e.g., specific margins, ROE values, debt levels)
-                4. Concluding with a Jhunjhunwala-style assessment of the investment opportunity
-                5. Using Rakesh Jhunjhunwala's voice and conversational style in your explanation
-
-                For example, if bullish: "I'm particularly impressed with the consistent growth and strong balance sheet, reminiscent of quality companies that create long-term wealth..."
-                For example, if bearish: "The deteriorating margins and high debt levels concern me - this doesn't fit the profile of companies that build lasting value..."
-
-                Follow these guidelines strictly.
-                """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following data, create the investment signal as Rakesh Jhunjhunwala would:
-
-                Analysis Data for {ticker}:
-                {analysis_data}
-
-                Return the trading signal in the following JSON format exactly:
-                {{
-                  "signal": "bullish" | "bearish" | "neutral",
-                  "confidence": float between 0 and 100,
-                  "reasoning": "string"
-                }}
-                """,
-        },
-    ],
-    "hedge-fund/stanley_druckenmiller": [
-        {
-            "role": "system",
-            "content": """You are a Stanley Druckenmiller AI agent, making investment decisions using his principles:
-            
-              1. Seek asymmetric risk-reward opportunities (large upside, limited downside).
-              2. Emphasize growth, momentum, and market sentiment.
-              3. Preserve capital by avoiding major drawdowns.
-              4. Willing to pay higher valuations for true growth leaders.
-              5. Be aggressive when conviction is high.
-              6. Cut losses quickly if the thesis changes.
-                            
-              Rules:
-              - Reward companies showing strong revenue/earnings growth and positive stock momentum.
-              - Evaluate sentiment and insider activity as supportive or contradictory signals.
-              - Watch out for high leverage or extreme volatility that threatens capital.
-              - Output a JSON object with signal, confidence, and a reasoning string.
-              
-              When providing your reasoning, be thorough and specific by:
-              1. Explaining the growth and momentum metrics that most influenced your decision
-              2. Highlighting the risk-reward profile with specific numerical evidence
-              3. Discussing market sentiment and catalysts that could drive price action
-              4. Addressing both upside potential and downside risks
-              5. Providing specific valuation context relative to growth prospects
-              6. Using Stanley Druckenmiller's decisive, momentum-focused, and conviction-driven voice
-              
-              For example, if bullish: "The company shows exceptional momentum with revenue accelerating from 22% to 35% YoY and the stock up 28% over the past three months. Risk-reward is highly asymmetric with 70% upside potential based on FCF multiple expansion and only 15% downside risk given the strong balance sheet with 3x cash-to-debt. Insider buying and positive market sentiment provide additional tailwinds..."
-              For example, if bearish: "Despite recent stock momentum, revenue growth has decelerated from 30% to 12% YoY, and operating margins are contracting. The risk-reward proposition is unfavorable with limited 10% upside potential against 40% downside risk. The competitive landscape is intensifying, and insider selling suggests waning confidence. I'm seeing better opportunities elsewhere with more favorable setups..."
-              """,
-        },
-        {
-            "role": "human",
-            "content": """Based on the following analysis, create a Druckenmiller-style investment signal.
-
-              Analysis Data for {ticker}:
-              {analysis_data}
-
-              Return the trading signal in this JSON format:
-              {{
-                "signal": "bullish/bearish/neutral",
-                "confidence": float (0-100),
-                "reasoning": "string"
-              }}
-              """,
-        },
-    ],
-    "hedge-fund/final_report": [
-        {
-            "role": "system",
-            "content": """你是一位专业投资研报撰写员。请根据下方提供的「各分析师信号」与「组合经理最终决策」，
-用中文撰写一份类似 Deep Research 的深度研报，使用 Markdown 格式。
-
-要求：
-1. 结构清晰，包含：摘要、各标的/分析师观点汇总、综合结论与操作建议。
-2. 语言专业、简洁，数据与结论有据可依。
-3. 最终你必须返回合法 JSON，且仅包含一个字段 "report"，值为研报全文的 Markdown 字符串。""",
-        },
+
+# Offline LLMLingua-compressed system prompts written by scripts/compress_prompts.py (optional file);
+# the loader serves them instead of the defaults when HEDGEFUND_COMPRESSED_PROMPTS=1
+COMPRESSED_PROMPTS_PATH = Path(__file__).with_name("compressed_prompts.json")
+
+
+def _load_compressed_prompts() -> Mapping[str, tuple[Mapping[str, str], ...]]:
+    if not COMPRESSED_PROMPTS_PATH.exists():
+        return MappingProxyType({})
+    data = json.loads(COMPRESSED_PROMPTS_PATH.read_text(encoding="utf-8"))
+    return MappingProxyType(
         {
-            "role": "human",
-            "content": """请根据以下信息撰写中文深度研报：
+            name: tuple(MappingProxyType({"role": m["role"], "content": m["content"]}) for m in messages)
+            for name, messages in data.items()
+            if name in DEFAULT_PROMPTS
+        }
+    )
 
-{context}
 
-请返回唯一一个 JSON 对象：{{ "report": "研报全文的 Markdown 内容" }}。""",
-        },
-    ],
-}
+COMPRESSED_PROMPTS = _load_compressed_prompts()
+
+
+_BATCHED_HUMAN = """Based on the following analyses, create one investment signal per ticker.
+
+Analysis Data by ticker:
+{ticker_analysis_bundle}"""
+
 
+def _batched_variant(messages: tuple[Mapping[str, str], ...]) -> tuple[Mapping[str, str], ...] | None:
+    """Persona variant answering for many tickers at once; None if the prompt isn't a single-ticker signal."""
+    system, human = messages
+    if not system["content"].endswith(SIGNAL_JSON_SCHEMA) or "{analysis_data}" not in human["content"]:
+        return None
+    # Same system text up to the schema, so the batched call still shares the cached prefix
+    batched_system = system["content"][: -len(SIGNAL_JSON_SCHEMA)] + BATCHED_SIGNAL_JSON_SCHEMA
+    return (
+        MappingProxyType({"role": "system", "content": batched_system}),
+        MappingProxyType({"role": "human", "content": _BATCHED_HUMAN}),
+    )
 
-def get_default_messages(name: str) -> list[dict[str, str]]:
-    """Return default chat messages for the given prompt name. Raises KeyError if unknown."""
+
+# "<name>__batched" -> messages, for personas whose prompt is {ticker} + {analysis_data} -> signal.
+# Kept out of DEFAULT_PROMPTS so they are not synced to Langfuse as separate prompts.
+_BATCHED_PROMPTS: Mapping[str, tuple[Mapping[str, str], ...]] = MappingProxyType(
+    {
+        f"{name}__batched": variant
+        for name, messages in DEFAULT_PROMPTS.items()
+        if (variant := _batched_variant(messages)) is not None
+    }
+)
+
+# Rough input budget per batched call (~4 chars per token); larger ticker sets are sharded
+BATCH_TOKEN_BUDGET = 24_000
+
+
+def get_default_messages(name: str, compressed: bool = False, batch: bool = False) -> tuple[Mapping[str, str], ...]:
+    """
+    Return default chat messages for the given prompt name. Raises KeyError if unknown.
+    The result is shared and read-only; copy it (e.g. [dict(m) for m in ...]) to modify.
+    With compressed=True, return the compressed version when one exists (else the default).
+    With batch=True, return the multi-ticker variant (placeholder {ticker_analysis_bundle}).
+    """
+    if batch:
+        if f"{name}__batched" not in _BATCHED_PROMPTS:
+            raise KeyError(f"No batched variant for prompt: {name}. Known: {list(_BATCHED_PROMPTS)}")
+        return _BATCHED_PROMPTS[f"{name}__batched"]
+    if compressed and name in COMPRESSED_PROMPTS:
+        return COMPRESSED_PROMPTS[name]
     if name not in DEFAULT_PROMPTS:
         raise KeyError(f"Unknown prompt name: {name}. Known: {list(DEFAULT_PROMPTS)}")
-    return list(DEFAULT_PROMPTS[name])
+    return DEFAULT_PROMPTS[name]
+
+
+def compile_template(template: str) -> Callable[[Mapping[str, Any]], str]:
+    """
+    Parse a {variable} template once into literal chunks and field names; the returned
+    render(variables) only concatenates, instead of re-parsing the multi-KB text per call.
+    Same output as template.format(**variables); render.fields lists the placeholders.
+    Raises ValueError for format specs, conversions or attribute/index access (unsupported
+    by the LangChain f-string templates these prompts are also used as).
+    """
+    # literals[i] precedes fields[i]; escaped braces ({{ }}) arrive as extra field-less chunks
+    literals: list[str] = [""]
+    fields: list[str] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        literals[-1] += literal
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier():
+            raise ValueError(f"Unsupported placeholder {{{field}}} in prompt template")
+        fields.append(field)
+        literals.append("")
+    head, pairs = literals[0], tuple(zip(fields, literals[1:]))
+
+    def render(variables: Mapping[str, Any]) -> str:
+        out = [head]
+        for field, literal in pairs:
+            out.append(str(variables[field]))
+            out.append(literal)
+        return "".join(out)
+
+    render.fields = frozenset(fields)
+    return render
+
+
+_PERSONA_VARS = frozenset({"ticker", "analysis_data"})
+_BATCHED_VARS = frozenset({"ticker_analysis_bundle"})
+
+# Render inputs each prompt is documented to take (the keys agents pass to render_prompt). Checked
+# against the templates' placeholders at import, so a data/*.md edit that adds or drops a
+# {variable} fails here instead of mid-run.
+EXPECTED_VARS: Mapping[str, frozenset[str]] = MappingProxyType(
+    {
+        "hedge-fund/ben_graham": _PERSONA_VARS,
+        "hedge-fund/bill_ackman": _PERSONA_VARS,
+        "hedge-fund/cathie_wood": _PERSONA_VARS,
+        "hedge-fund/charlie_munger": frozenset({"ticker", "facts", "confidence"}),
+        "hedge-fund/aswath_damodaran": _PERSONA_VARS,
+        "hedge-fund/michael_burry": _PERSONA_VARS,
+        "hedge-fund/mohnish_pabrai": _PERSONA_VARS,
+        "hedge-fund/peter_lynch": _PERSONA_VARS,
+        "hedge-fund/phil_fisher": _PERSONA_VARS,
+        "hedge-fund/rakesh_jhunjhunwala": _PERSONA_VARS,
+        "hedge-fund/stanley_druckenmiller": _PERSONA_VARS,
+        "hedge-fund/warren_buffett": frozenset({"ticker", "facts", "company_context_block"}),
+        "hedge-fund/portfolio_manager__decisions": frozenset({"signals", "allowed"}),
+        "hedge-fund/final_report": frozenset({"context"}),
+        "hedge-fund/final_report__stream": frozenset({"context"}),
+    }
+)
+
+CompiledMessages = tuple[tuple[str, Callable[[Mapping[str, Any]], str]], ...]
+
+
+def _compile_messages(name: str, messages: Iterable[Mapping[str, str]]) -> CompiledMessages:
+    """((role, render), ...) for messages; ValueError unless their placeholders are exactly EXPECTED_VARS[name]."""
+    compiled = tuple((m["role"], compile_template(m["content"])) for m in messages)
+    fields = frozenset().union(*(render.fields for _, render in compiled))
+    expected = _BATCHED_VARS if name.endswith("__batched") else EXPECTED_VARS.get(name)
+    if fields != expected:
+        raise ValueError(f"{name} placeholders {sorted(fields)} != EXPECTED_VARS {sorted(expected or ())}")
+    return compiled
+
+
+# name -> ((role, render), ...), compiled and validated at import; the loader renders registry
+# prompts through these instead of re-parsing the template text on every call
+_COMPILED_PROMPTS: Mapping[str, CompiledMessages] = MappingProxyType(
+    {name: _compile_messages(name, messages) for name, messages in DEFAULT_PROMPTS.items()}
+)
+
+_COMPILED_BATCHED: Mapping[str, CompiledMessages] = MappingProxyType(
+    {name: _compile_messages(name, messages) for name, messages in _BATCHED_PROMPTS.items()}
+)
+
+# name -> every {variable} its messages reference (the render inputs callers must provide)
+PROMPT_VARS: Mapping[str, frozenset[str]] = MappingProxyType({name: EXPECTED_VARS[name] for name in DEFAULT_PROMPTS})
+
+
+@lru_cache(maxsize=64)
+def _compile_compressed(name: str) -> CompiledMessages:
+    return _compile_messages(name, COMPRESSED_PROMPTS[name])
+
+
+def get_compiled_messages(name: str, compressed: bool = False, batch: bool = False) -> CompiledMessages:
+    """Precompiled ((role, render), ...) for name, the compressed version when asked and available."""
+    if batch:
+        if f"{name}__batched" not in _COMPILED_BATCHED:
+            raise KeyError(f"No batched variant for prompt: {name}. Known: {list(_BATCHED_PROMPTS)}")
+        return _COMPILED_BATCHED[f"{name}__batched"]
+    if compressed and name in COMPRESSED_PROMPTS:
+        return _compile_compressed(name)
+    if name not in _COMPILED_PROMPTS:
+        raise KeyError(f"Unknown prompt name: {name}. Known: {list(DEFAULT_PROMPTS)}")
+    return _COMPILED_PROMPTS[name]
+
+
+def validate_render_inputs(name: str, provided: Iterable[str]) -> None:
+    """Raise KeyError naming the missing variables if provided doesn't cover PROMPT_VARS[name]."""
+    if name not in PROMPT_VARS:
+        raise KeyError(f"Unknown prompt name: {name}. Known: {list(DEFAULT_PROMPTS)}")
+    missing = PROMPT_VARS[name].difference(provided)
+    if missing:
+        raise KeyError(f"{name} missing render vars: {sorted(missing)}")
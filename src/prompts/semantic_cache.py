@@ -0,0 +1,134 @@
+"""
+Semantic completion cache for near-duplicate persona prompts.
+Between reruns a ticker's fundamentals often move only in the decimals (FCF yield 12.8% vs
+12.9%), which defeats the exact-match cache in cache.py. Prompts are bucketed by their text
+with every number masked (same persona, ticker, model and wording), and within a bucket the
+stored reply of the nearest prompt embedding is reused when cosine similarity >= threshold.
+
+Opt-in per persona (HEDGEFUND_LLM_SEMANTIC_CACHE=warren_buffett,ben_graham; matched as agent id
+prefixes so backend node ids like warren_buffett_1a2b qualify too): only enable it for personas
+whose signal has been checked offline to be stable under small numeric perturbations.
+Requires the optional sentence-transformers package.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from src.prompts.cache import DEFAULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEMANTIC_CACHE_PATH = DEFAULT_CACHE_PATH.with_name("semantic_cache.sqlite")
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SIMILARITY = 0.98
+
+_NUMBER_RE = re.compile(r"-?\d+(?:[.,]\d+)*")
+
+
+def semantic_bucket(messages: Iterable[tuple[str, str]], *scope: str) -> str:
+    """Key shared by prompts that differ only in their numbers: masked text plus scope."""
+    masked = "\x1e".join(f"{role}\x1f{_NUMBER_RE.sub('#', content)}" for role, content in messages)
+    payload = "\x1d".join((*scope, masked)).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class SemanticCompletionCache:
+    """SQLite-backed (bucket, embedding) -> response store; nearest neighbour by inner product."""
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_SEMANTIC_CACHE_PATH,
+        threshold: float = DEFAULT_SIMILARITY,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.path = Path(path)
+        self.threshold = threshold
+        self.model_name = model_name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._encoder = SentenceTransformer(model_name)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_completions "
+            "(bucket TEXT NOT NULL, embedding BLOB NOT NULL, response TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_completions_bucket ON semantic_completions (bucket)"
+        )
+
+    def bucket(self, messages: Iterable[tuple[str, str]], *scope: str) -> str:
+        """semantic_bucket scoped to this cache's embedding model, so switching models never mixes vectors."""
+        return semantic_bucket(messages, *scope, self.model_name)
+
+    def embed(self, text: str) -> np.ndarray | None:
+        """Unit-norm float32 embedding, so inner product is cosine similarity; None if encoding fails."""
+        try:
+            return self._encoder.encode(text, normalize_embeddings=True).astype(np.float32)
+        except Exception as e:
+            logger.debug("Semantic cache embedding failed: %s", e)
+            return None
+
+    def get(self, bucket: str, embedding: np.ndarray) -> str | None:
+        """Nearest stored reply above the threshold; read/shape errors are logged and count as a miss."""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT embedding, response FROM semantic_completions WHERE bucket = ?", (bucket,)
+                ).fetchall()
+            if not rows:
+                return None
+            matrix = np.frombuffer(b"".join(r[0] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+            scores = matrix @ embedding
+        except (sqlite3.Error, ValueError) as e:
+            logger.debug("Semantic cache read failed: %s", e)
+            return None
+        best = int(np.argmax(scores))
+        return rows[best][1] if scores[best] >= self.threshold else None
+
+    def put(self, bucket: str, embedding: np.ndarray, response: str) -> None:
+        """Store response; write errors are logged, never raised."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO semantic_completions (bucket, embedding, response) VALUES (?, ?, ?)",
+                    (bucket, embedding.tobytes(), response),
+                )
+        except sqlite3.Error as e:
+            logger.debug("Semantic cache write failed: %s", e)
+
+
+@lru_cache(maxsize=1)
+def _semantic_agents() -> tuple[str, ...]:
+    return tuple(a.strip() for a in (os.getenv("HEDGEFUND_LLM_SEMANTIC_CACHE") or "").split(",") if a.strip())
+
+
+@lru_cache(maxsize=1)
+def _shared_cache() -> SemanticCompletionCache | None:
+    try:
+        return SemanticCompletionCache(
+            os.getenv("HEDGEFUND_LLM_SEMANTIC_CACHE_PATH") or DEFAULT_SEMANTIC_CACHE_PATH,
+            float(os.getenv("HEDGEFUND_LLM_SEMANTIC_CACHE_SIM") or DEFAULT_SIMILARITY),
+        )
+    except Exception as e:
+        logger.warning("Semantic LLM cache unavailable (is sentence-transformers installed?): %s", e)
+        return None
+
+
+def get_semantic_cache(agent_name: str | None) -> SemanticCompletionCache | None:
+    """Process-wide semantic cache if agent_name matches HEDGEFUND_LLM_SEMANTIC_CACHE, else None."""
+    if not agent_name or not agent_name.startswith(tuple(_semantic_agents())):
+        return None
+    return _shared_cache()
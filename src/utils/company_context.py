@@ -1,53 +1,168 @@
 """Helpers for company context (name, sector, industry) passed from stock input to agents."""
 
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+
+import orjson
 
 from src.tools.api import get_company_facts
 
 logger = logging.getLogger(__name__)
 
+# Company context of the current graph run. Kept out of graph state so tracing callbacks
+# (Langfuse/LangSmith) don't re-serialize it with every node's inputs and outputs.
+_COMPANY_CONTEXT: ContextVar[dict | None] = ContextVar("company_context", default=None)
+
+# Company facts change on a slow (weekly) cadence; cache them per ticker, in process and on disk,
+# so warm tickers skip the HTTP fetch. One small JSON file per ticker with the six fields used.
+COMPANY_FACTS_CACHE_DIR = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-hedge-fund" / "company_facts"
+)
+_COMPANY_FACTS_TTL_SEC = 7 * 86400
+# ticker -> (fetched_at, ctx); bounded like an lru_cache(maxsize=4096)
+_FACTS_MEMO: dict[str, tuple[float, dict]] = {}
+_FACTS_MEMO_MAX = 4096
+_FACTS_MEMO_LOCK = threading.Lock()
+# Upper bound on concurrent get_company_facts requests per build_company_context call
+_FETCH_WORKERS = 16
+
+
+def _facts_path(ticker: str) -> Path:
+    return COMPANY_FACTS_CACHE_DIR / f"{ticker.replace('/', '_')}.json"
+
+
+def _read_facts_file(ticker: str, now: float) -> dict | None:
+    path = _facts_path(ticker)
+    try:
+        if now - path.stat().st_mtime >= _COMPANY_FACTS_TTL_SEC:
+            return None
+        data = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("company facts cache for %s unreadable, ignoring: %s", ticker, e)
+        return None
+    return data if isinstance(data, dict) and data else None
+
+
+def _write_facts_file(ticker: str, ctx: dict) -> None:
+    path = _facts_path(ticker)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent runs never read a half-written file
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(orjson.dumps(ctx))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.debug("company facts cache for %s not saved: %s", ticker, e)
+
+
+# (context key, label) in prompt order
+_FIELDS = (("name", "Company"), ("sector", "Sector"), ("industry", "Industry"), ("exchange", "Exchange"))
+
+
+def _format_line(ctx: dict) -> str:
+    """Prompt line for one ticker's context, in a fixed field order (byte-identical across agents)."""
+    return " | ".join(f"{label}: {value}" for key, label in _FIELDS if (value := ctx.get(key)))
+
+
+def _remember(ticker: str, now: float, ctx: dict) -> dict:
+    """Memoize ctx in process, with its prompt line precomputed under "formatted"."""
+    if "formatted" not in ctx:
+        ctx = {**ctx, "formatted": _format_line(ctx)}
+    with _FACTS_MEMO_LOCK:
+        if ticker not in _FACTS_MEMO and len(_FACTS_MEMO) >= _FACTS_MEMO_MAX:
+            _FACTS_MEMO.pop(next(iter(_FACTS_MEMO)))
+        _FACTS_MEMO[ticker] = (now, ctx)
+    return ctx
+
+
+def _cached_facts(ticker: str, now: float) -> dict | None:
+    """Company context from the in-process memo or the disk cache, or None on a miss."""
+    memo = _FACTS_MEMO.get(ticker)
+    if memo is not None and now - memo[0] < _COMPANY_FACTS_TTL_SEC:
+        return memo[1]
+    ctx = _read_facts_file(ticker, now)
+    return _remember(ticker, now, ctx) if ctx is not None else None
+
+
+def _fetch_facts(ticker: str, api_key: str | None = None) -> dict:
+    """Fetch one ticker from the API and cache it. Empty results are not cached."""
+    facts = get_company_facts(ticker, api_key=api_key)
+    if facts is None:
+        logger.warning("get_company_facts %s: no data (API returned none)", ticker)
+        return {}
+    logger.debug("get_company_facts %s: name=%s sector=%s", ticker, getattr(facts, "name", None), getattr(facts, "sector", None))
+    ctx = {
+        "name": facts.name,
+        "sector": facts.sector,
+        "industry": facts.industry,
+        "category": facts.category,
+        "exchange": facts.exchange,
+        "location": facts.location,
+    }
+    _write_facts_file(ticker, ctx)
+    return _remember(ticker, time.time(), ctx)
+
+
+def _fetch_facts_cached(ticker: str, api_key: str | None = None) -> dict:
+    """
+    Company context for one ticker: in-process memo, then disk cache, then the API.
+    Keyed by ticker only (the API key does not change the facts).
+    """
+    ctx = _cached_facts(ticker, time.time())
+    return ctx if ctx is not None else _fetch_facts(ticker, api_key)
+
 
 def build_company_context(tickers: list[str], api_key: str | None = None) -> dict:
     """
     Fetch company facts for each ticker. Returns dict ticker -> {name, sector, industry, ...}.
     Used to pass company details from the graph start into analyst nodes.
+    Facts are cached per ticker for _COMPANY_FACTS_TTL_SEC; cache misses are fetched
+    concurrently (up to _FETCH_WORKERS at a time).
     """
-    company_context = {}
-    for ticker in tickers:
-        facts = get_company_facts(ticker, api_key=api_key)
-        if facts is not None:
-            logger.debug("get_company_facts %s: name=%s sector=%s", ticker, getattr(facts, "name", None), getattr(facts, "sector", None))
-            company_context[ticker] = {
-                "name": facts.name,
-                "sector": facts.sector,
-                "industry": facts.industry,
-                "category": facts.category,
-                "exchange": facts.exchange,
-                "location": facts.location,
-            }
-        else:
-            logger.warning("get_company_facts %s: no data (API returned none)", ticker)
-            company_context[ticker] = {}
+    now = time.time()
+    company_context = {ticker: _cached_facts(ticker, now) for ticker in tickers}
+    missing = [ticker for ticker, ctx in company_context.items() if ctx is None]
+    if len(missing) == 1:
+        company_context[missing[0]] = _fetch_facts(missing[0], api_key)
+    elif missing:
+        with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(missing))) as ex:
+            for ticker, ctx in zip(missing, ex.map(lambda t: _fetch_facts(t, api_key), missing)):
+                company_context[ticker] = ctx
     return company_context
 
 
+@contextmanager
+def company_context_scope(company_context: dict) -> Iterator[dict]:
+    """
+    Make company_context visible to agent nodes while the graph runs, e.g.
+    `with company_context_scope(ctx): graph.invoke(...)`. LangGraph runs nodes in a copy
+    of the caller's context, so the value reaches every analyst thread.
+    """
+    token = _COMPANY_CONTEXT.set(company_context)
+    try:
+        yield company_context
+    finally:
+        _COMPANY_CONTEXT.reset(token)
+
+
 def format_company_context_for_prompt(ticker: str, state_data: dict) -> str:
     """
-    From state["data"]["company_context"], format a short line for the given ticker
-    for use in agent prompts (e.g. "Company: Apple Inc., Sector: Technology, Industry: Consumer Electronics").
+    From state["data"]["company_context"] (or the active company_context_scope), return the short
+    line for the given ticker for use in agent prompts (e.g. "Company: Apple Inc. | Sector: Technology | Industry: Consumer Electronics").
+    build_company_context precomputes it under "formatted"; other contexts are formatted on the fly.
     """
-    ctx = (state_data.get("company_context") or {}).get(ticker) or {}
+    company_context = state_data.get("company_context") or _COMPANY_CONTEXT.get() or {}
+    ctx = company_context.get(ticker) or {}
     if not ctx:
         return ""
-    parts = []
-    if ctx.get("name"):
-        parts.append(f"Company: {ctx['name']}")
-    if ctx.get("sector"):
-        parts.append(f"Sector: {ctx['sector']}")
-    if ctx.get("industry"):
-        parts.append(f"Industry: {ctx['industry']}")
-    if ctx.get("exchange"):
-        parts.append(f"Exchange: {ctx['exchange']}")
-    if not parts:
-        return ""
-    return " | ".join(parts)
+    formatted = ctx.get("formatted")
+    return formatted if formatted is not None else _format_line(ctx)
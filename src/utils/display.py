@@ -1,6 +1,7 @@
 from colorama import Fore, Style
 from tabulate import tabulate
 from .analysts import ANALYST_ORDER
+from .llm import cascade_stats
 import os
 import json
 
@@ -263,6 +264,18 @@ def print_trading_output(result: dict) -> None:
         print(f"{Fore.CYAN}{wrapped_reasoning}{Style.RESET_ALL}")
 
 
+def print_cascade_summary() -> None:
+    """Print how many analyst calls the LLM cascade answered cheaply vs escalated (only when HEDGEFUND_LLM_CASCADE=1 was used)."""
+    stats = cascade_stats()
+    if not (stats["cheap"] or stats["escalated"]):
+        return
+    # The split is what CASCADE_THRESHOLD / HEDGEFUND_CASCADE_THRESHOLD is tuned against
+    print(
+        f"{Fore.WHITE}{Style.BRIGHT}LLM cascade:{Style.RESET_ALL} "
+        f"{stats['cheap']} answered by the cheap model, {stats['escalated']} escalated to the selected model"
+    )
+
+
 def print_backtest_results(table_rows: list) -> None:
     """Print the backtest results in a nicely formatted table"""
     # Clear the screen
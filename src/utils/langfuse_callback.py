@@ -4,30 +4,111 @@ Langfuse 可观测：为 LangChain/LangGraph 提供 callback，用于追踪 LLM
 """
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import threading
+import time
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Process-wide CallbackHandler: v3 handlers keep per-run state keyed by run_id, so one instance
+# serves every invoke (tags/session_id travel in the config). Created on first use.
+_HANDLER: Any = None
+_HANDLER_LOCK = threading.Lock()
 
+# Background flusher: langfuse_flush() only signals; one daemon thread runs client.flush(),
+# coalescing requests that arrive while a flush is in progress into the next one.
+_FLUSH_EVENT = threading.Event()
+# Debounce window: requests finishing together (concurrent API calls) share one upload
+_FLUSH_DEBOUNCE_SEC = 0.05
+_FLUSHER: threading.Thread | None = None
+_FLUSHER_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
 def is_langfuse_configured() -> bool:
-    """是否已配置 Langfuse（用于决定是否 flush）。"""
+    """是否已配置 Langfuse（用于决定是否 flush）。首次调用时读取环境变量并缓存（须在 load_dotenv 之后）。"""
     return bool(os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY"))
 
 
-def langfuse_flush() -> None:
-    """请求结束后调用，确保 trace 在响应返回前上报。未配置时无操作。"""
-    if not is_langfuse_configured():
-        return
+def reset_cache() -> None:
+    """清除缓存的配置判断（测试中修改环境变量后调用）。"""
+    is_langfuse_configured.cache_clear()
+    _flush_mode.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _flush_mode() -> str:
+    """"sync" (HEDGEFUND_LANGFUSE_ENFORCE_FLUSH=1), "async" (default) or "off" (HEDGEFUND_LANGFUSE_ASYNC_FLUSH=0)."""
+    if os.getenv("HEDGEFUND_LANGFUSE_ENFORCE_FLUSH", "false").lower() in ("true", "1"):
+        return "sync"
+    if os.getenv("HEDGEFUND_LANGFUSE_ASYNC_FLUSH", "1").lower() in ("true", "1"):
+        return "async"
+    return "off"
+
+
+@lru_cache(maxsize=1)
+def _langfuse_get_client():
+    """langfuse.get_client, imported once (None if langfuse is unavailable)."""
     try:
         from langfuse import get_client
+    except ImportError as e:
+        logger.debug("Langfuse flush unavailable: %s", e)
+        return None
+    return get_client
 
+
+def _flush_now() -> None:
+    get_client = _langfuse_get_client()
+    if get_client is None:
+        return
+    try:
         get_client().flush()
     except Exception as e:
         logger.debug("Langfuse flush: %s", e)
 
 
+def _drain() -> None:
+    while True:
+        _FLUSH_EVENT.wait()
+        time.sleep(_FLUSH_DEBOUNCE_SEC)
+        _FLUSH_EVENT.clear()
+        _flush_now()
+
+
+def _start_flusher() -> None:
+    global _FLUSHER
+    with _FLUSHER_LOCK:
+        if _FLUSHER is None:
+            _FLUSHER = threading.Thread(target=_drain, name="langfuse-flusher", daemon=True)
+            _FLUSHER.start()
+            # The daemon thread dies with the process; upload whatever is still buffered at exit
+            atexit.register(_flush_now)
+
+
+def langfuse_flush() -> None:
+    """
+    请求结束后调用，上报 trace。未配置时无操作。
+    - 默认：只通知后台线程 flush，不阻塞响应；连续多次请求合并为一次，进程退出时再同步 flush 一次。
+    - HEDGEFUND_LANGFUSE_ENFORCE_FLUSH=1：在当前线程同步 flush，返回时 trace 已上报（测试等严格场景）。
+    - HEDGEFUND_LANGFUSE_ASYNC_FLUSH=0：完全不 flush（fire-and-forget），由 Langfuse SDK 自身的后台导出上报。
+    """
+    if not is_langfuse_configured():
+        return
+    mode = _flush_mode()
+    if mode == "sync":
+        _flush_now()
+        return
+    if mode == "off":
+        return
+    if _FLUSHER is None:
+        _start_flusher()
+    _FLUSH_EVENT.set()
+
+
 def get_langfuse_callbacks(
     *,
     session_id: str | None = None,
@@ -40,14 +121,20 @@ def get_langfuse_callbacks(
     用法: graph.invoke(input, config={"callbacks": get_langfuse_callbacks()})
     Langfuse v3 CallbackHandler 不再通过 __init__ 接收 tags/session_id 等，此处保留参数以兼容调用方，创建时使用无参。
     """
+    global _HANDLER
     if not is_langfuse_configured():
         return []
+    if _HANDLER is not None:
+        return [_HANDLER]
 
-    try:
-        from langfuse.langchain import CallbackHandler
+    with _HANDLER_LOCK:
+        if _HANDLER is None:
+            try:
+                from langfuse.langchain import CallbackHandler
 
-        # Langfuse v3 CallbackHandler 仅支持无参或少量参数，tags/session_id 等通过 config 传入
-        return [CallbackHandler()]
-    except Exception as e:
-        logger.warning("Langfuse CallbackHandler 不可用，跳过 tracing: %s", e)
-        return []
+                # Langfuse v3 CallbackHandler 仅支持无参或少量参数，tags/session_id 等通过 config 传入
+                _HANDLER = CallbackHandler()
+            except Exception as e:
+                logger.warning("Langfuse CallbackHandler 不可用，跳过 tracing: %s", e)
+                return []
+    return [_HANDLER]
@@ -1,31 +1,86 @@
 """
 LangSmith 可观测：LangChain 官方 tracing。
 设置 LANGSMITH_TRACING=true 与 LANGSMITH_API_KEY 后，LangChain 会自动上报 trace。
-请求结束后调用 langsmith_flush() 确保在响应返回前完成上报。
+请求结束后调用 langsmith_flush()：默认不阻塞；HEDGEFUND_LANGSMITH_ENFORCE_FLUSH=1 时等待上报完成（每次请求最多一次）。
 """
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+from contextvars import ContextVar
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
 
+
+@lru_cache(maxsize=1)
 def is_langsmith_configured() -> bool:
-    """是否已启用 LangSmith（用于决定是否 wait_for_all_tracers）。"""
+    """是否已启用 LangSmith（用于决定是否 wait_for_all_tracers）。首次调用时读取环境变量并缓存（须在 load_dotenv 之后）。"""
     return (
-        os.getenv("LANGSMITH_TRACING", "").lower() in ("true", "1")
+        os.getenv("LANGSMITH_TRACING", "").strip().lower() in _TRUTHY
         and bool(os.getenv("LANGSMITH_API_KEY"))
     )
 
 
-def langsmith_flush() -> None:
-    """请求结束后调用，等待 LangSmith tracer 上报完成。未配置时无操作。"""
-    if not is_langsmith_configured():
-        return
+@lru_cache(maxsize=1)
+def _enforce_flush() -> bool:
+    return os.getenv("HEDGEFUND_LANGSMITH_ENFORCE_FLUSH", "false").strip().lower() in _TRUTHY
+
+
+def reset_cache() -> None:
+    """清除缓存的配置判断（测试中修改环境变量后调用）。"""
+    is_langsmith_configured.cache_clear()
+    _enforce_flush.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _wait_for_all_tracers_fn():
+    """langchain_core's wait_for_all_tracers, imported once (None if unavailable)."""
     try:
         from langchain_core.tracers.langchain import wait_for_all_tracers
+    except ImportError as e:
+        logger.debug("LangSmith wait_for_all_tracers unavailable: %s", e)
+        return None
+    return wait_for_all_tracers
 
+
+def _wait_for_tracers() -> None:
+    wait_for_all_tracers = _wait_for_all_tracers_fn()
+    if wait_for_all_tracers is None:
+        return
+    try:
         wait_for_all_tracers()
     except Exception as e:
         logger.debug("LangSmith wait_for_all_tracers: %s", e)
+
+
+_exit_wait_registered = False
+# Set once this request/run has waited for the tracers; later flushes in it are no-ops.
+# Each HTTP request runs in its own context; sequential runs in one thread call reset_langsmith_flush_ctx().
+_FLUSHED: ContextVar[bool] = ContextVar("langsmith_flushed", default=False)
+
+
+def reset_langsmith_flush_ctx() -> None:
+    """在一次请求/运行开始时调用，使本次的 langsmith_flush() 重新生效。"""
+    _FLUSHED.set(False)
+
+
+def langsmith_flush() -> None:
+    """
+    请求结束后调用。未配置时无操作。
+    默认不阻塞：tracer 在后台线程上报，进程退出时再等待一次全部上报完成。
+    HEDGEFUND_LANGSMITH_ENFORCE_FLUSH=1 时在当前线程等待上报完成（测试等严格场景）。
+    """
+    global _exit_wait_registered
+    if not is_langsmith_configured():
+        return
+    if _enforce_flush():
+        if not _FLUSHED.get():
+            _wait_for_tracers()
+            _FLUSHED.set(True)
+    elif not _exit_wait_registered:
+        _exit_wait_registered = True
+        atexit.register(_wait_for_tracers)
@@ -1,11 +1,44 @@
 """Helper functions for LLM"""
 
 import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompts import SystemMessagePromptTemplate
 from pydantic import BaseModel
-from src.llm.models import get_model, get_model_info
+from src.llm.models import ModelProvider, get_model, get_model_info
+from src.prompts.cache import completion_cache_key, get_completion_cache
+from src.prompts.registry import PROMPT_CACHE_CONTROL, PROMPT_NAMES, get_default_messages
+from src.prompts.semantic_cache import get_semantic_cache
 from src.utils.progress import progress
 from src.graph.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+# Cheap first-pass model per provider for the opt-in cascade (HEDGEFUND_LLM_CASCADE=1).
+# Persona signals are answered by this tier; only uncertain replies go to the configured model.
+# Ids are each provider's own (OpenRouter slugs are vendor/model, not Anthropic's dated ids).
+MODEL_TIER = {
+    ModelProvider.OPENAI: "gpt-4.1-mini",
+    ModelProvider.ANTHROPIC: "claude-haiku-4-5-20251001",
+    ModelProvider.OPENROUTER: "anthropic/claude-haiku-4.5",
+    ModelProvider.DASHSCOPE: "qwen-flash",
+    ModelProvider.DEEPSEEK: "deepseek-chat",
+    ModelProvider.GOOGLE: "gemini-2.5-flash",
+    ModelProvider.XAI: "grok-3-mini",
+}
+CASCADE_THRESHOLD = 60
+
+# Escalation counters, so CASCADE_THRESHOLD can be tuned from real runs (see cascade_stats())
+_CASCADE_STATS = {"cheap": 0, "escalated": 0}
+_CASCADE_STATS_LOCK = threading.Lock()
+# (model, provider) pairs whose cheap call failed (bad id, no access); skipped for the rest of the process
+_CASCADE_UNAVAILABLE: set[tuple[str, str]] = set()
+
 
 def call_llm(
     prompt: any,
@@ -29,7 +62,86 @@ def call_llm(
     Returns:
         An instance of the specified Pydantic model
     """
-    
+    model_name, model_provider, api_keys = _resolve_model(agent_name, state)
+
+    cheap_model = _cascade_model(model_name, model_provider, pydantic_model)
+
+    # Replay identical prompts from the on-disk completion cache (opt-in, HEDGEFUND_LLM_CACHE=1)
+    cache = get_completion_cache()
+    semantic = get_semantic_cache(agent_name)
+    cache_key = None
+    if cache is not None or semantic is not None:
+        pairs = _prompt_pairs(prompt)
+        scope = (model_name, str(model_provider), pydantic_model.__name__) + ((cheap_model,) if cheap_model else ())
+    if cache is not None:
+        cache_key = completion_cache_key(pairs, *scope)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            try:
+                return pydantic_model.model_validate_json(cached)
+            except Exception:
+                pass  # Schema changed since it was stored; call the model again
+    # Then near-duplicates (same prompt up to its numbers) for personas that opted in
+    if semantic is not None:
+        bucket = semantic.bucket(pairs, *scope)
+        embedding = semantic.embed("\n".join(content for _, content in pairs))
+        if embedding is None:
+            semantic = None  # Encoder failed; behave as if the semantic cache were off
+    if semantic is not None:
+        cached = semantic.get(bucket, embedding)
+        if cached is not None:
+            try:
+                return pydantic_model.model_validate_json(cached)
+            except Exception:
+                pass
+
+    result = None
+    if cheap_model:
+        # Cascade: cheap model first; the configured model only sees low-confidence/neutral replies.
+        # One quiet attempt: a failing cheap tier falls straight through instead of burning retries.
+        result = _invoke_with_retries(
+            prompt, pydantic_model, cheap_model, model_provider, api_keys, None, 1, report_errors=False
+        )
+        if result is None:
+            _CASCADE_UNAVAILABLE.add((cheap_model, str(model_provider)))
+            logger.warning("Cascade model %s (%s) failed; using %s directly from now on", cheap_model, model_provider, model_name)
+        escalate = result is None or _needs_escalation(result)
+        with _CASCADE_STATS_LOCK:
+            _CASCADE_STATS["escalated" if escalate else "cheap"] += 1
+        if escalate:
+            logger.debug("Cascade escalation for %s (%s -> %s)", agent_name, cheap_model, model_name)
+            result = None
+    if result is None:
+        result = _invoke_with_retries(prompt, pydantic_model, model_name, model_provider, api_keys, agent_name, max_retries)
+
+    if result is not None:
+        if cache_key is not None:
+            cache.put(cache_key, result.model_dump_json())
+        if semantic is not None:
+            semantic.put(bucket, embedding, result.model_dump_json())
+        return result
+    # Use default_factory if provided, otherwise create a basic default
+    if default_factory:
+        return default_factory()
+    return create_default_response(pydantic_model)
+
+
+def stream_llm(prompt: any, agent_name: str | None = None, state: AgentState | None = None) -> Iterator[str]:
+    """
+    Stream a free-text completion chunk by chunk, using the same model configuration as
+    call_llm. No retries or caching: errors propagate so the caller can fall back to call_llm.
+    """
+    model_name, model_provider, api_keys = _resolve_model(agent_name, state)
+    llm = get_model(model_name, model_provider, api_keys)
+    if model_provider == ModelProvider.ANTHROPIC:
+        prompt = _with_prompt_cache_breakpoint(prompt)
+    for chunk in llm.stream(prompt):
+        if isinstance(chunk.content, str) and chunk.content:
+            yield chunk.content
+
+
+def _resolve_model(agent_name: str | None, state: AgentState | None) -> tuple[str, str, dict | None]:
+    """(model_name, model_provider, api_keys) for an agent call."""
     # Extract model configuration if state is provided and agent_name is available
     if state and agent_name:
         model_name, model_provider = get_agent_model_config(state, agent_name)
@@ -44,9 +156,24 @@ def call_llm(
         request = state.get("metadata", {}).get("request")
         if request and hasattr(request, 'api_keys'):
             api_keys = request.api_keys
+    return model_name, model_provider, api_keys
+
 
+def _invoke_with_retries(
+    prompt: any,
+    pydantic_model: type[BaseModel],
+    model_name: str,
+    model_provider: str,
+    api_keys: dict | None,
+    agent_name: str | None,
+    max_retries: int,
+    report_errors: bool = True,
+) -> BaseModel | None:
+    """One model's structured call with retries; None once every attempt has failed (printed unless report_errors=False)."""
     model_info = get_model_info(model_name, model_provider)
     llm = get_model(model_name, model_provider, api_keys)
+    if model_provider == ModelProvider.ANTHROPIC:
+        prompt = _with_prompt_cache_breakpoint(prompt)
 
     # For non-JSON support models, we can use structured output
     if not (model_info and not model_info.has_json_mode()):
@@ -63,14 +190,18 @@ def call_llm(
 
             # For non-JSON support models, we need to extract and parse the JSON manually
             if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
+                json_text = _extract_json_block(result.content)
+                if not json_text:
+                    continue
+                # pydantic-core parses and validates in one pass (no json.loads dict in between)
+                result = pydantic_model.model_validate_json(json_text)
+            return result
 
         except Exception as e:
             err_msg = str(e)
+            if not report_errors:
+                logger.debug("LLM call to %s failed: %s", model_name, e)
+                continue
             if agent_name:
                 progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
 
@@ -82,13 +213,155 @@ def call_llm(
                     )
                 else:
                     print(f"Error in LLM call after {max_retries} attempts: {e}")
-                # Use default_factory if provided, otherwise create a basic default
-                if default_factory:
-                    return default_factory()
-                return create_default_response(pydantic_model)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _cascade_settings() -> tuple[bool, str | None, float]:
+    """(enabled, cheap model override, threshold); read on first use, after load_dotenv."""
+    return (
+        os.getenv("HEDGEFUND_LLM_CASCADE", "0") == "1",
+        os.getenv("HEDGEFUND_CASCADE_MODEL") or None,
+        float(os.getenv("HEDGEFUND_CASCADE_THRESHOLD") or CASCADE_THRESHOLD),
+    )
+
+
+def _cascade_model(model_name: str, model_provider: str, pydantic_model: type[BaseModel]) -> str | None:
+    """
+    Cheap first-pass model for this call, or None to call the configured model directly.
+    Only persona-style {signal, confidence, ...} replies cascade; aggregating calls (portfolio
+    manager decisions, final report) always use the configured model.
+    """
+    enabled, override, _ = _cascade_settings()
+    if not enabled or not {"signal", "confidence"} <= pydantic_model.model_fields.keys():
+        return None
+    cheap = override or MODEL_TIER.get(model_provider)
+    if not cheap or cheap == model_name or (cheap, str(model_provider)) in _CASCADE_UNAVAILABLE:
+        return None
+    return cheap
+
+
+def _needs_escalation(result: BaseModel) -> bool:
+    """
+    Re-ask the configured model when the cheap tier is unsure or sits on the fence. Decided per
+    call from the reply alone: cross-persona disagreement or a portfolio-manager ambiguity flag
+    would need the other analysts' results, which are not available inside one analyst's call.
+    """
+    return getattr(result, "signal", None) == "neutral" or (getattr(result, "confidence", 0) or 0) < _cascade_settings()[2]
+
+
+def cascade_stats() -> dict[str, int]:
+    """Cheap-tier answers vs escalations since process start."""
+    with _CASCADE_STATS_LOCK:
+        return dict(_CASCADE_STATS)
+
+
+def _prompt_pairs(prompt: any) -> list[tuple[str, str]]:
+    """(role, content) pairs of a prompt value, message list or plain string, for cache keys."""
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    if isinstance(prompt, str):
+        return [("human", prompt)]
+    return [(m.type, m.content if isinstance(m.content, str) else json.dumps(m.content)) for m in prompt]
+
+
+def _with_prompt_cache_breakpoint(prompt: any) -> any:
+    """
+    Anthropic only caches prompt prefixes up to an explicit cache_control marker. Registry system
+    prompts are static, so mark each system message as a breakpoint; other providers cache
+    byte-identical prefixes automatically and get the prompt unchanged.
+    """
+    if not hasattr(prompt, "to_messages"):
+        return prompt
+    return [
+        SystemMessage(content=[{"type": "text", "text": m.content, "cache_control": PROMPT_CACHE_CONTROL}])
+        if isinstance(m, SystemMessage) and isinstance(m.content, str)
+        else m
+        for m in prompt.to_messages()
+    ]
+
+
+# Self-hosted backends whose prefix cache (vLLM automatic prefix caching, llama.cpp / Ollama
+# slot cache) is local to the server and cold after a restart; hosted APIs warm themselves.
+# Value: the field that caps generation, so a warm-up request only prefills.
+_SELF_HOSTED_MAX_TOKENS_FIELD = {
+    ModelProvider.OLLAMA: "num_predict",
+    ModelProvider.OPENAI_COMPATIBLE: "max_tokens",
+}
 
-    # This should never be reached due to the retry logic above
-    return create_default_response(pydantic_model)
+
+# (model, provider, prompt) already prefilled in this process
+_WARMED: set[tuple[str, str, str]] = set()
+_WARMED_LOCK = threading.Lock()
+
+
+def warm_prompt_names(analysts: Iterable[str]) -> tuple[str, ...]:
+    """Registry prompts a run with these analyst keys will send: their persona prompts plus the portfolio manager."""
+    personas = {f"hedge-fund/{key}" for key in analysts} & set(PROMPT_NAMES)
+    return (*sorted(personas), "hedge-fund/portfolio_manager__decisions")
+
+
+def warm_prompt_caches(
+    model_name: str,
+    model_provider: str,
+    prompt_names: tuple[str, ...] = PROMPT_NAMES,
+    api_keys: dict | None = None,
+) -> int:
+    """
+    Prefill each registry system prompt once on a self-hosted model so the first real analyst
+    request reuses its KV cache (and, for Ollama, the model is already loaded). One 1-token
+    request per prompt; hosted providers are skipped, and each (model, provider, prompt) is
+    warmed at most once per process. Returns how many prompts were warmed.
+    """
+    field = _SELF_HOSTED_MAX_TOKENS_FIELD.get(model_provider)
+    if field is None:
+        return 0
+    with _WARMED_LOCK:
+        pending = [n for n in prompt_names if (model_name, str(model_provider), n) not in _WARMED]
+        _WARMED.update((model_name, str(model_provider), n) for n in pending)
+    if not pending:
+        return 0
+    try:
+        llm = get_model(model_name, model_provider, api_keys).model_copy(update={field: 1})
+    except Exception as e:
+        logger.warning("Prompt cache warm-up skipped: %s", e)
+        return 0
+
+    def _warm(name: str) -> int:
+        try:
+            # Registry content is a template (literal braces are escaped); render it as the agents do
+            system = SystemMessagePromptTemplate.from_template(get_default_messages(name)[0]["content"]).format()
+            llm.invoke([system, HumanMessage(content="OK")])
+            return 1
+        except Exception as e:
+            logger.debug("Prompt cache warm-up failed for %s: %s", name, e)
+            return 0
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return sum(pool.map(_warm, pending))
+
+
+def start_prompt_cache_warmup(
+    model_name: str,
+    model_provider: str,
+    prompt_names: tuple[str, ...],
+    api_keys: dict | None = None,
+) -> threading.Thread | None:
+    """
+    Run warm_prompt_caches in a daemon thread so graph execution starts right away; analysts
+    spend their first seconds fetching data, which is when the prefill requests land.
+    Returns the thread, or None for hosted providers (nothing to warm).
+    """
+    if model_provider not in _SELF_HOSTED_MAX_TOKENS_FIELD:
+        return None
+    thread = threading.Thread(
+        target=warm_prompt_caches,
+        args=(model_name, model_provider, prompt_names, api_keys),
+        name="prompt-cache-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
 
 
 def create_default_response(model_class: type[BaseModel]) -> BaseModel:
@@ -113,16 +386,24 @@ def create_default_response(model_class: type[BaseModel]) -> BaseModel:
     return model_class(**default_values)
 
 
+def _extract_json_block(content: str) -> str | None:
+    """Text of the first ```json fenced block in a markdown-formatted response, if any."""
+    json_start = content.find("```json")
+    if json_start == -1:
+        return None
+    json_text = content[json_start + 7 :]  # Skip past ```json
+    json_end = json_text.find("```")
+    if json_end == -1:
+        return None
+    return json_text[:json_end].strip()
+
+
 def extract_json_from_response(content: str) -> dict | None:
     """Extracts JSON from markdown-formatted response."""
     try:
-        json_start = content.find("```json")
-        if json_start != -1:
-            json_text = content[json_start + 7 :]  # Skip past ```json
-            json_end = json_text.find("```")
-            if json_end != -1:
-                json_text = json_text[:json_end].strip()
-                return json.loads(json_text)
+        json_text = _extract_json_block(content)
+        if json_text is not None:
+            return json.loads(json_text)
     except Exception as e:
         print(f"Error extracting JSON from response: {e}")
     return None
@@ -3,11 +3,29 @@
 """
 from __future__ import annotations
 
+import asyncio
+import io
 import json
+import logging
+from typing import Callable, Iterator
+
 from pydantic import BaseModel, Field
 
-from src.prompts import get_prompt_template
-from src.utils.llm import call_llm
+from src.prompts import render_prompt
+from src.utils.llm import call_llm, stream_llm
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    # numpy scalars/arrays and anything else non-native (Decimal, dates) must not fail the report
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _dumps_indented(obj) -> str:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _dumps_indented = json.JSONEncoder(ensure_ascii=False, indent=2, sort_keys=True, default=str).encode
 
 
 class FinalReportOutput(BaseModel):
@@ -16,24 +34,49 @@ class FinalReportOutput(BaseModel):
 
 
 def _format_context(decisions: dict, analyst_signals: dict, current_prices: dict | None = None) -> str:
-    """将决策与分析师信号格式化为供 LLM 使用的上下文字符串。"""
-    lines = ["## 组合经理最终决策", "```json", json.dumps(decisions, ensure_ascii=False, indent=2), "```"]
-    lines.append("\n## 各分析师信号（按标的）")
-    tickers = set()
-    for _agent, signals in analyst_signals.items():
-        tickers.update(signals.keys())
-    for ticker in sorted(tickers):
-        lines.append(f"\n### {ticker}")
+    """将决策与分析师信号格式化为供 LLM 使用的上下文字符串。决策与分析师均按 key 排序，相同输入得到相同 prompt。"""
+    buf = io.StringIO()
+    # Locals for the per-signal loop (LOAD_FAST instead of attribute lookups)
+    write = buf.write
+    write("## 组合经理最终决策\n```json\n")
+    write(_dumps_indented(decisions))
+    write("\n```\n\n## 各分析师信号（按标的）")
+    # One pass over all signals: ticker -> [(agent, signal), ...], agents in sorted order.
+    # Entries without a signal (e.g. risk manager position limits) are left out, so a ticker
+    # with no analyst signal gets no section (nor price line) at all.
+    by_ticker: dict[str, list[tuple[str, dict]]] = {}
+    setdefault = by_ticker.setdefault
+    for agent, signals in sorted(analyst_signals.items()):
+        for ticker, s in signals.items():
+            if s.get("signal") is not None:
+                setdefault(ticker, []).append((agent, s))
+    for ticker in sorted(by_ticker):
+        # Each ticker section is assembled, then written with one call
+        section = [f"\n\n### {ticker}"]
         if current_prices and ticker in current_prices:
-            lines.append(f"当前价格: {current_prices[ticker]}")
-        for agent, signals in analyst_signals.items():
-            if ticker not in signals:
-                continue
-            s = signals[ticker]
-            lines.append(f"- **{agent}**: {s.get('signal', '')} (置信度: {s.get('confidence', 0)})")
-            if s.get("reasoning"):
-                lines.append(f"  {s['reasoning'][:200]}{'...' if len(s.get('reasoning', '')) > 200 else ''}")
-    return "\n".join(lines)
+            section.append(f"\n当前价格: {current_prices[ticker]}")
+        for agent, s in by_ticker[ticker]:
+            section.append(f"\n- **{agent}**: {s.get('signal', '')} (置信度: {s.get('confidence', 0)})")
+            reasoning = s.get("reasoning")
+            if reasoning:
+                section.append(f"\n  {reasoning[:200]}..." if len(reasoning) > 200 else f"\n  {reasoning}")
+        write("".join(section))
+    return buf.getvalue()
+
+
+def stream_final_report(
+    decisions: dict,
+    analyst_signals: dict,
+    current_prices: dict | None = None,
+    state: dict | None = None,
+) -> Iterator[str]:
+    """
+    流式生成研报：模型直接输出 Markdown（无 JSON 包裹），逐段 yield，供 UI/日志边生成边展示。
+    出错时异常直接抛出，由调用方决定是否回退到 generate_final_report(strict_json=True)。
+    """
+    context = _format_context(decisions, analyst_signals or {}, current_prices)
+    prompt = render_prompt("hedge-fund/final_report__stream", {"context": context})
+    yield from stream_llm(prompt, agent_name="final_report", state=state)
 
 
 def generate_final_report(
@@ -41,14 +84,34 @@ def generate_final_report(
     analyst_signals: dict,
     current_prices: dict | None = None,
     state: dict | None = None,
+    strict_json: bool = False,
+    on_chunk: Callable[[str], None] | None = None,
 ) -> str:
     """
     根据最终决策与分析师信号生成中文深度研报（Markdown）。
     若 state 提供 metadata（model_name, model_provider, request），则使用同配置的 LLM。
+    默认走流式纯 Markdown 输出（on_chunk 可实时接收片段）；流式失败或 strict_json=True 时
+    使用 JSON 包裹的 hedge-fund/final_report（带重试与默认值）。
+    无决策且无分析师信号时不调用 LLM，直接返回提示。
     """
+    if not decisions and not analyst_signals:
+        return "研报生成失败：无决策与分析师信号。"
+    if not strict_json:
+        chunks: list[str] = []
+        try:
+            for chunk in stream_final_report(decisions, analyst_signals, current_prices, state):
+                chunks.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+        except Exception as e:
+            logger.warning("Streaming final report failed, retrying as JSON: %s", e)
+            chunks = []
+        report = "".join(chunks).strip()
+        if report:
+            return report
+
     context = _format_context(decisions, analyst_signals or {}, current_prices)
-    template = get_prompt_template("hedge-fund/final_report")
-    prompt = template.invoke({"context": context})
+    prompt = render_prompt("hedge-fund/final_report", {"context": context})
     agent_name = "final_report"
     out = call_llm(
         prompt=prompt,
@@ -58,3 +121,14 @@ def generate_final_report(
         default_factory=lambda: FinalReportOutput(report="研报生成失败，请查看各分析师信号与决策。"),
     )
     return out.report if out else ""
+
+
+async def generate_final_report_async(
+    decisions: dict,
+    analyst_signals: dict,
+    current_prices: dict | None = None,
+    state: dict | None = None,
+    **kwargs,
+) -> str:
+    """generate_final_report 的异步版本：在线程中执行阻塞的 LLM 调用，不占用事件循环。参数同 generate_final_report。"""
+    return await asyncio.to_thread(generate_final_report, decisions, analyst_signals, current_prices, state, **kwargs)
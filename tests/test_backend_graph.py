@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from app.backend.services.graph import count_analyst_nodes, create_graph
+
+
+def test_count_analyst_nodes_ignores_non_analysts():
+    node_ids = [
+        "__start__",
+        "start_node",
+        "warren_buffett_abc123",
+        "ben_graham_x1y2z3",
+        "risk_management_agent_abc123",
+        "portfolio_manager_abc123",
+    ]
+    assert count_analyst_nodes(node_ids) == 2
+
+
+def test_count_analyst_nodes_on_compiled_graph():
+    nodes = [SimpleNamespace(id=i) for i in ("warren_buffett_abc123", "michael_burry_def456", "portfolio_manager_aaa111")]
+    edges = [
+        SimpleNamespace(source="warren_buffett_abc123", target="portfolio_manager_aaa111"),
+        SimpleNamespace(source="michael_burry_def456", target="portfolio_manager_aaa111"),
+    ]
+    graph = create_graph(nodes, edges).compile()
+    # Same cap as run_hedge_fund(selected_analysts=["warren_buffett", "michael_burry"])
+    assert count_analyst_nodes(graph.nodes) == 2
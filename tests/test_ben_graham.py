@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.agents.ben_graham import BenGrahamBatchOutput, BenGrahamSignal, ben_graham_agent
+from src.prompts import loader
+
+TICKERS = ["AAPL", "MSFT", "NVDA"]
+
+
+@pytest.fixture()
+def no_data(monkeypatch):
+    monkeypatch.setattr(loader, "is_langfuse_configured", lambda: False)
+    with (
+        patch("src.agents.ben_graham.get_financial_metrics", return_value=[]),
+        patch("src.agents.ben_graham.search_line_items", return_value=[]),
+        patch("src.agents.ben_graham.get_market_cap", return_value=None),
+    ):
+        yield
+
+
+def _state(tickers: list[str]) -> dict:
+    return {
+        "data": {"tickers": tickers, "end_date": "2024-12-31", "analyst_signals": {}},
+        "metadata": {"show_reasoning": False},
+    }
+
+
+@patch("src.agents.ben_graham.call_llm")
+def test_one_llm_call_for_many_tickers(mock_call_llm, no_data):
+    # Reply omits NVDA, which falls back to the neutral default
+    mock_call_llm.return_value = BenGrahamBatchOutput(
+        signals={
+            "AAPL": BenGrahamSignal(signal="bearish", confidence=70, reasoning="no margin of safety"),
+            "MSFT": BenGrahamSignal(signal="neutral", confidence=50, reasoning="fair value"),
+        }
+    )
+    state = _state(TICKERS)
+
+    ben_graham_agent(state)
+
+    mock_call_llm.assert_called_once()
+    messages = mock_call_llm.call_args.kwargs["prompt"].to_messages()
+    assert all(f'"{ticker}"' in messages[1].content for ticker in TICKERS)
+    signals = state["data"]["analyst_signals"]["ben_graham_agent"]
+    assert [signals[t]["signal"] for t in TICKERS] == ["bearish", "neutral", "neutral"]
+    assert signals["NVDA"]["confidence"] == 0.0
+
+
+@patch("src.agents.ben_graham.call_llm")
+def test_single_ticker_uses_per_ticker_prompt(mock_call_llm, no_data):
+    mock_call_llm.return_value = BenGrahamSignal(signal="bullish", confidence=80, reasoning="net-net")
+    state = _state(["AAPL"])
+
+    ben_graham_agent(state)
+
+    mock_call_llm.assert_called_once()
+    assert mock_call_llm.call_args.kwargs["pydantic_model"] is BenGrahamSignal
+    assert state["data"]["analyst_signals"]["ben_graham_agent"]["AAPL"]["signal"] == "bullish"
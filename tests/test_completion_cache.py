@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from src.prompts import cache as cache_module
+from src.prompts.cache import PromptCompletionCache, completion_cache_key
+from src.utils import llm as llm_module
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: int
+    reasoning: str
+
+
+PROMPT = [("system", "You are Warren Buffett."), ("human", "Analyze AAPL")]
+SCOPE = ("gpt-4.1", "OpenAI", "Signal")
+
+
+@pytest.fixture()
+def cache(tmp_path) -> PromptCompletionCache:
+    return PromptCompletionCache(tmp_path / "llm_cache.sqlite", ttl_sec=60)
+
+
+def test_cache_key_is_deterministic():
+    assert completion_cache_key(PROMPT, *SCOPE) == completion_cache_key(list(PROMPT), *SCOPE)
+
+
+def test_cache_key_is_order_sensitive():
+    assert completion_cache_key(PROMPT, *SCOPE) != completion_cache_key(PROMPT[::-1], *SCOPE)
+    assert completion_cache_key(PROMPT, *SCOPE) != completion_cache_key(PROMPT, *SCOPE[::-1])
+
+
+def test_cache_key_depends_on_scope():
+    assert completion_cache_key(PROMPT, *SCOPE) != completion_cache_key(PROMPT, "gpt-4.1-mini", "OpenAI", "Signal")
+
+
+def test_cache_roundtrip(cache):
+    key = completion_cache_key(PROMPT, *SCOPE)
+    assert cache.get(key) is None
+    cache.put(key, '{"x": 1}')
+    assert cache.get(key) == '{"x": 1}'
+
+
+def test_cache_entry_expires_after_ttl(cache):
+    key = completion_cache_key(PROMPT, *SCOPE)
+    with patch.object(cache_module.time, "time", return_value=1_000.0):
+        cache.put(key, '{"x": 1}')
+    with patch.object(cache_module.time, "time", return_value=1_059.0):
+        assert cache.get(key) == '{"x": 1}'
+    with patch.object(cache_module.time, "time", return_value=1_060.0):
+        assert cache.get(key) is None
+
+
+def _cached_key(prompt) -> str:
+    return completion_cache_key(llm_module._prompt_pairs(prompt), "gpt-4.1", "OPENAI", "Signal")
+
+
+@patch("src.utils.llm.get_semantic_cache", return_value=None)
+@patch("src.utils.llm._invoke_with_retries")
+def test_call_llm_cache_hit_skips_model(mock_invoke, _mock_semantic, cache):
+    prompt = "Analyze AAPL"
+    cache.put(_cached_key(prompt), Signal(signal="bullish", confidence=80, reasoning="moat").model_dump_json())
+
+    with patch("src.utils.llm.get_completion_cache", return_value=cache):
+        result = llm_module.call_llm(prompt, Signal)
+
+    assert result == Signal(signal="bullish", confidence=80, reasoning="moat")
+    mock_invoke.assert_not_called()
+
+
+@patch("src.utils.llm.get_semantic_cache", return_value=None)
+@patch("src.utils.llm._invoke_with_retries")
+def test_call_llm_corrupt_cache_entry_calls_model(mock_invoke, _mock_semantic, cache):
+    prompt = "Analyze AAPL"
+    key = _cached_key(prompt)
+    cache.put(key, '{"signal": "bullish", "confid')
+    fresh = Signal(signal="bearish", confidence=70, reasoning="expensive")
+    mock_invoke.return_value = fresh
+
+    with patch("src.utils.llm.get_completion_cache", return_value=cache):
+        result = llm_module.call_llm(prompt, Signal)
+
+    assert result == fresh
+    mock_invoke.assert_called_once()
+    # The fresh reply replaces the corrupt entry
+    assert Signal.model_validate_json(cache.get(key)) == fresh
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.backend.routes import language_models
+from app.backend.routes.language_models import _etag_matches
+
+ETAG = 'W/"42-abc"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('W/"42-abc"', True),
+        ('"42-abc"', True),
+        ("*", True),
+        ('"1-x", W/"42-abc"', True),
+        ('"1-x",W/"2-y"', False),
+        ('W/"42-abcd"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert _etag_matches(header, ETAG) is expected
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+    app.include_router(language_models.router)
+    return TestClient(app)
+
+
+async def _no_ollama_models():
+    return []
+
+
+@patch.object(language_models, "_ollama_models", _no_ollama_models)
+@patch.object(language_models, "_cloud_models_in_thread")
+def test_conditional_get_skips_the_cloud_model_read(mock_cloud, client):
+    mock_cloud.return_value = [{"display_name": "GPT-4.1", "model_name": "gpt-4.1", "provider": "OpenAI"}]
+
+    first = client.get("/language-models/")
+    assert first.status_code == 200
+    assert mock_cloud.call_count == 1
+
+    etag = first.headers["etag"]
+    again = client.get("/language-models/", headers={"If-None-Match": f'"stale", {etag}'})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert mock_cloud.call_count == 1
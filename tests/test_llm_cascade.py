@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from src.utils import llm as llm_module
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: int
+    reasoning: str
+
+
+class _FakeLLM:
+    """Structured-output stand-in: the cheap model raises, the configured one answers."""
+
+    def __init__(self, model_name: str, calls: list[str]):
+        self.model_name = model_name
+        self.calls = calls
+
+    def with_structured_output(self, *args, **kwargs):
+        return self
+
+    def invoke(self, prompt):
+        self.calls.append(self.model_name)
+        if self.model_name == "gpt-4.1-mini":
+            raise RuntimeError("model not found")
+        return Signal(signal="bullish", confidence=90, reasoning="ok")
+
+
+@pytest.fixture()
+def cascade(monkeypatch):
+    monkeypatch.setenv("HEDGEFUND_LLM_CASCADE", "1")
+    monkeypatch.delenv("HEDGEFUND_CASCADE_MODEL", raising=False)
+    llm_module._cascade_settings.cache_clear()
+    llm_module._CASCADE_UNAVAILABLE.clear()
+    calls: list[str] = []
+    with patch.object(llm_module, "get_completion_cache", return_value=None), patch.object(
+        llm_module, "get_semantic_cache", return_value=None
+    ), patch.object(llm_module, "get_model_info", return_value=None), patch.object(
+        llm_module, "get_model", side_effect=lambda name, provider, api_keys=None: _FakeLLM(name, calls)
+    ):
+        yield calls
+    llm_module._cascade_settings.cache_clear()
+    llm_module._CASCADE_UNAVAILABLE.clear()
+
+
+def test_failing_cheap_model_is_tried_once_then_skipped(cascade):
+    state = {"metadata": {"model_name": "gpt-4.1", "model_provider": "OpenAI"}}
+
+    first = llm_module.call_llm("Analyze AAPL", Signal, agent_name="warren_buffett_agent", state=state)
+    assert first.signal == "bullish"
+    # One attempt on the cheap tier (no retries), then the configured model
+    assert cascade == ["gpt-4.1-mini", "gpt-4.1"]
+
+    cascade.clear()
+    llm_module.call_llm("Analyze MSFT", Signal, agent_name="warren_buffett_agent", state=state)
+    assert cascade == ["gpt-4.1"]
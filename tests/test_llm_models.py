@@ -0,0 +1,36 @@
+import pytest
+
+from src.llm import models
+
+
+@pytest.fixture(autouse=True)
+def _fresh_env_cache():
+    # Memoized values would otherwise outlive monkeypatch's env restore
+    yield
+    models.reset_cache()
+
+
+def test_env_is_memoized_until_reset(monkeypatch):
+    monkeypatch.setenv("HEDGEFUND_TEST_ENV_VALUE", "first")
+    models.reset_cache()
+    assert models._env("HEDGEFUND_TEST_ENV_VALUE") == "first"
+
+    monkeypatch.setenv("HEDGEFUND_TEST_ENV_VALUE", "second")
+    assert models._env("HEDGEFUND_TEST_ENV_VALUE") == "first"
+
+    models.reset_cache()
+    assert models._env("HEDGEFUND_TEST_ENV_VALUE") == "second"
+
+    monkeypatch.delenv("HEDGEFUND_TEST_ENV_VALUE")
+    models.reset_cache()
+    assert models._env("HEDGEFUND_TEST_ENV_VALUE", "default") == "default"
+
+
+def test_reset_cache_rebuilds_model_clients(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    models.reset_cache()
+    first = models.get_model("gpt-4.1", models.ModelProvider.OPENAI)
+    assert models.get_model("gpt-4.1", models.ModelProvider.OPENAI) is first
+
+    models.reset_cache()
+    assert models.get_model("gpt-4.1", models.ModelProvider.OPENAI) is not first
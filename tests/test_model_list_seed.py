@@ -0,0 +1,43 @@
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.database.models import Base, LLMModel
+from app.backend.services import model_list_service
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    monkeypatch.setattr(model_list_service, "_seeded", False)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_static_model_list_path_exists():
+    assert model_list_service.API_MODELS_JSON_PATH.is_file()
+
+
+def test_seed_inserts_once_then_skips_the_query(db):
+    inserted = model_list_service.seed_from_json_if_empty(db)
+    assert inserted > 0
+    assert db.query(LLMModel).count() == inserted
+
+    # Later calls in the same process short-circuit without touching the DB
+    untouched = Mock()
+    assert model_list_service.seed_from_json_if_empty(untouched) == 0
+    untouched.query.assert_not_called()
+    untouched.execute.assert_not_called()
+
+
+def test_seed_marks_populated_table_as_seeded(db):
+    db.add(LLMModel(display_name="GPT-4.1", model_name="gpt-4.1", provider="OpenAI", sort_order=0, is_enabled=True, source="static"))
+    db.commit()
+
+    assert model_list_service.seed_from_json_if_empty(db) == 0
+    assert model_list_service._seeded is True
+    assert db.query(LLMModel).count() == 1
@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from src.agents.portfolio_manager import (
+    PortfolioDecision,
+    PortfolioManagerOutput,
+    _enforce_allowed,
+    generate_trading_decision,
+)
+
+ALLOWED = {"buy": 10, "sell": 5, "hold": 0}
+
+
+def _decision(action: str, quantity: int) -> PortfolioDecision:
+    return PortfolioDecision(action=action, quantity=quantity, confidence=80, reasoning="test")
+
+
+def test_disallowed_action_becomes_hold():
+    out = _enforce_allowed(_decision("short", 7), ALLOWED)
+    assert (out.action, out.quantity) == ("hold", 0)
+
+
+def test_quantity_over_max_is_clamped():
+    out = _enforce_allowed(_decision("buy", 25), ALLOWED)
+    assert (out.action, out.quantity) == ("buy", 10)
+
+
+def test_negative_quantity_is_clamped_to_zero():
+    out = _enforce_allowed(_decision("sell", -3), ALLOWED)
+    assert (out.action, out.quantity) == ("sell", 0)
+
+
+def test_allowed_decision_is_unchanged():
+    decision = _decision("sell", 5)
+    assert _enforce_allowed(decision, ALLOWED) is decision
+
+
+def test_missing_decision_defaults_to_hold():
+    out = _enforce_allowed(None, ALLOWED)
+    assert (out.action, out.quantity) == ("hold", 0)
+
+
+@patch("src.agents.portfolio_manager.call_llm")
+def test_generate_trading_decision_enforces_constraints(mock_call_llm):
+    # LLM over-buys AAPL and omits MSFT entirely
+    mock_call_llm.return_value = PortfolioManagerOutput(decisions={"AAPL": _decision("buy", 1_000)})
+    portfolio = {"cash": 1_000.0, "positions": {}, "margin_requirement": 0.5, "margin_used": 0.0}
+
+    out = generate_trading_decision(
+        tickers=["AAPL", "MSFT"],
+        signals_by_ticker={},
+        current_prices={"AAPL": 100.0, "MSFT": 100.0},
+        max_shares={"AAPL": 4, "MSFT": 4},
+        portfolio=portfolio,
+        agent_id="portfolio_manager",
+        state={"metadata": {}},
+    )
+
+    assert (out.decisions["AAPL"].action, out.decisions["AAPL"].quantity) == ("buy", 4)
+    assert (out.decisions["MSFT"].action, out.decisions["MSFT"].quantity) == ("hold", 0)
@@ -0,0 +1,40 @@
+import pytest
+
+from src.prompts.lint import simplify_deterministic
+
+
+def _prompts(content: str) -> dict:
+    return {"hedge-fund/test": ({"role": "system", "content": content},)}
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Bullish: strong business AND margin_of_safety > 0",
+        "Bearish if debt_to_equity >= 1.5",
+        "Neutral when roe < 10 OR moat is unclear",
+        "fcf_yield <= -2 means avoid",
+    ],
+)
+def test_flags_deterministic_rules(line):
+    assert simplify_deterministic(_prompts(f"You are an analyst.\n  {line}\n")) == [
+        ("hedge-fund/test", "system", line)
+    ]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Checklist (CHK): CoC=Circle of competence, MOAT=Competitive moat",
+        "Seek potential to double capital in 2-3 years with low risk.",
+        "Be candid and concise, and stay in character.",
+        "Score confidence from 0 to 100.",
+    ],
+)
+def test_ignores_prose(line):
+    assert simplify_deterministic(_prompts(line)) == []
+
+
+def test_shipped_prompts_have_no_deterministic_rules():
+    # Rules belong in Python (e.g. apply_buffett_rules); the model only sees their result
+    assert simplify_deterministic() == []
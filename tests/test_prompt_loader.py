@@ -0,0 +1,114 @@
+from types import MappingProxyType
+from unittest.mock import patch
+
+import pytest
+
+from src.prompts import loader, registry
+
+NAME = "hedge-fund/cathie_wood"
+COMPRESSED = MappingProxyType(
+    {NAME: ({"role": "system", "content": "Cathie Wood, short."}, {"role": "human", "content": "{ticker} {analysis_data}"})}
+)
+
+
+@pytest.fixture()
+def compressed_prompts(monkeypatch):
+    monkeypatch.setattr(registry, "COMPRESSED_PROMPTS", COMPRESSED)
+    monkeypatch.setattr(loader, "COMPRESSED_PROMPTS", COMPRESSED)
+    monkeypatch.setattr(loader, "is_langfuse_configured", lambda: False)
+    loader._use_compressed_prompts.cache_clear()
+    loader._PROMPT_CACHE.clear()
+    yield
+    loader._use_compressed_prompts.cache_clear()
+    loader._compile_registry_template.cache_clear()
+    registry._compile_compressed.cache_clear()
+    loader._PROMPT_CACHE.clear()
+
+
+def _system_text(template) -> str:
+    return template.invoke({"ticker": "AAPL", "analysis_data": "{}"}).to_messages()[0].content
+
+
+def test_compressed_prompts_off_by_default(compressed_prompts, monkeypatch):
+    monkeypatch.delenv("HEDGEFUND_COMPRESSED_PROMPTS", raising=False)
+    assert _system_text(loader._load_prompt_template(NAME, "production")) != "Cathie Wood, short."
+
+
+def test_compressed_prompts_served_when_enabled(compressed_prompts, monkeypatch):
+    monkeypatch.setenv("HEDGEFUND_COMPRESSED_PROMPTS", "1")
+    assert _system_text(loader._load_prompt_template(NAME, "production")) == "Cathie Wood, short."
+    # Prompts without a compressed version keep the default
+    default = registry.DEFAULT_PROMPTS["hedge-fund/ben_graham"][0]["content"]
+    assert _system_text(loader._load_prompt_template("hedge-fund/ben_graham", "production")) == default.format()
+
+
+@pytest.mark.parametrize(
+    "name, variables",
+    [
+        ("hedge-fund/ben_graham", {"ticker": "AAPL", "analysis_data": '{"score": 7}'}),
+        ("hedge-fund/charlie_munger", {"ticker": "AAPL", "facts": "{}", "confidence": 65}),
+        ("hedge-fund/final_report", {"context": "AAPL: buy 10"}),
+    ],
+)
+def test_render_prompt_matches_chat_prompt_template(name, variables, monkeypatch):
+    monkeypatch.setattr(loader, "is_langfuse_configured", lambda: False)
+    expected = loader._compile_registry_template(name).invoke(variables).to_messages()
+    assert loader.render_prompt(name, variables).to_messages() == expected
+
+
+def test_render_prompt_uses_compressed_prompts(compressed_prompts, monkeypatch):
+    monkeypatch.setenv("HEDGEFUND_COMPRESSED_PROMPTS", "1")
+    messages = loader.render_prompt(NAME, {"ticker": "AAPL", "analysis_data": "{}"}).to_messages()
+    assert [m.content for m in messages] == ["Cathie Wood, short.", "AAPL {}"]
+
+
+@patch("src.prompts.loader.get_prompt_template")
+def test_render_prompt_rejects_missing_vars_before_loading(mock_get_template):
+    with pytest.raises(KeyError, match="analysis_data"):
+        loader.render_prompt("hedge-fund/ben_graham", {"ticker": "AAPL"})
+    mock_get_template.assert_not_called()
+
+
+@patch("src.agents.ben_graham.call_llm")
+def test_agent_missing_var_never_reaches_llm(mock_call_llm, monkeypatch):
+    from src.agents.ben_graham import generate_graham_output
+
+    name = "hedge-fund/ben_graham"
+    monkeypatch.setattr(registry, "PROMPT_VARS", {**registry.PROMPT_VARS, name: registry.PROMPT_VARS[name] | {"sector"}})
+    with pytest.raises(KeyError, match="sector"):
+        generate_graham_output("AAPL", {"score": 7}, state={"metadata": {}}, agent_id="ben_graham_agent")
+    mock_call_llm.assert_not_called()
+
+
+def test_log_render_vars_lists_every_prompt(caplog):
+    with caplog.at_level("INFO", logger=loader.__name__):
+        loader.log_render_vars()
+    assert len(caplog.records) == len(registry.PROMPT_NAMES)
+    assert "hedge-fund/warren_buffett render vars: company_context_block, facts, ticker" in caplog.text
+
+
+def test_render_batched_keeps_the_persona_system_prefix():
+    [(tickers, prompt)] = loader.render_batched("hedge-fund/ben_graham", {"AAPL": {"score": 7}, "MSFT": {"score": 3}})
+    assert tickers == ["AAPL", "MSFT"]
+    default_system = registry.DEFAULT_PROMPTS["hedge-fund/ben_graham"][0]["content"]
+    prefix = default_system[: -len(registry.SIGNAL_JSON_SCHEMA)].format()
+    system, human = prompt.to_messages()
+    assert system.content.startswith(prefix)
+    assert system.content.endswith(registry.BATCHED_SIGNAL_JSON_SCHEMA.format())
+    assert '"MSFT": {' in human.content
+
+
+def test_render_batched_shards_by_token_budget():
+    per_ticker = {f"T{i}": {"notes": "x" * 400} for i in range(5)}
+    overhead = sum(len(m["content"]) for m in registry.get_default_messages("hedge-fund/ben_graham", batch=True)) // 4
+    # Room for two ~100-token tickers per shard
+    shards = loader.render_batched("hedge-fund/ben_graham", per_ticker, token_budget=overhead + 230)
+    assert [tickers for tickers, _ in shards] == [["T0", "T1"], ["T2", "T3"], ["T4"]]
+    # An oversized ticker still gets its own shard
+    shards = loader.render_batched("hedge-fund/ben_graham", per_ticker, token_budget=1)
+    assert [tickers for tickers, _ in shards] == [[f"T{i}"] for i in range(5)]
+
+
+def test_render_batched_unknown_variant():
+    with pytest.raises(KeyError):
+        loader.render_batched("hedge-fund/charlie_munger", {"AAPL": {}})
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+
+from src.prompts.registry import (
+    DEFAULT_PROMPTS,
+    PROMPT_DATA_DIR,
+    PROMPT_NAMES,
+    SIGNAL_JSON_SCHEMA,
+    _compile_messages,
+    compile_template,
+    validate_render_inputs,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+# Modules that render registry prompts through render_prompt(name, {...})
+SOURCES = sorted((ROOT / "src" / "agents").glob("*.py")) + [ROOT / "src" / "utils" / "report.py"]
+
+
+@pytest.mark.parametrize(
+    "template, variables",
+    [
+        ("plain text", {}),
+        ("{ticker}", {"ticker": "AAPL"}),
+        ("Analyze {ticker}:\n{analysis_data}\nDone", {"ticker": "AAPL", "analysis_data": '{"a": 1}'}),
+        ("JSON: {{\n  \"signal\": \"{signal}\"\n}}", {"signal": "bullish"}),
+        ("{{literal}} {{{ticker}}} {{", {"ticker": "MSFT"}),
+        ("{a}{b}{a}", {"a": 1, "b": 2.5}),
+    ],
+)
+def test_compile_template_matches_str_format(template, variables):
+    assert compile_template(template)(variables) == template.format(**variables)
+
+
+def test_compile_template_fields():
+    assert compile_template("{{x}} {ticker} {analysis_data} {ticker}").fields == {"ticker", "analysis_data"}
+
+
+@pytest.mark.parametrize("template", ["{ticker!r}", "{confidence:.2f}", "{data.value}", "{items[0]}"])
+def test_compile_template_rejects_unsupported_placeholders(template):
+    with pytest.raises(ValueError):
+        compile_template(template)
+
+
+@pytest.mark.parametrize("name", list(DEFAULT_PROMPTS))
+def test_registry_prompts_render_like_str_format(name):
+    for message in DEFAULT_PROMPTS[name]:
+        render = compile_template(message["content"])
+        variables = {field: f"<{field}>" for field in render.fields}
+        assert render(variables) == message["content"].format(**variables)
+
+
+def test_expected_vars_mismatch_raises():
+    messages = ({"role": "system", "content": "{signal_schema}"}, {"role": "human", "content": "{ticker}"})
+    with pytest.raises(ValueError, match="EXPECTED_VARS"):
+        _compile_messages("hedge-fund/ben_graham", messages)
+
+
+def test_every_prompt_is_rendered_somewhere():
+    # No orphans synced to Langfuse; render inputs are checked at render time by render_prompt
+    sources = "".join(path.read_text(encoding="utf-8") for path in SOURCES)
+    orphans = [name for name in PROMPT_NAMES if f'"{name}"' not in sources]
+    assert not orphans
+
+
+def test_validate_render_inputs_names_missing_vars():
+    validate_render_inputs("hedge-fund/ben_graham", {"ticker", "analysis_data", "extra"})
+    with pytest.raises(KeyError, match="analysis_data"):
+        validate_render_inputs("hedge-fund/ben_graham", {"ticker"})
+
+
+PERSONA_PROMPTS = [
+    name
+    for name in PROMPT_NAMES
+    if "{signal_schema}" in (PROMPT_DATA_DIR / f"{name.split('/', 1)[1]}.system.md").read_text(encoding="utf-8")
+]
+
+
+@pytest.mark.parametrize("name", PERSONA_PROMPTS)
+def test_persona_system_prompts_share_the_schema_suffix(name):
+    # Byte-identical tail across personas: no indentation or trailing text around the schema
+    system = DEFAULT_PROMPTS[name][0]["content"]
+    assert system.endswith("\n\n" + SIGNAL_JSON_SCHEMA)
+    last_line = system[: -len(SIGNAL_JSON_SCHEMA)].rstrip("\n").rsplit("\n", 1)[-1]
+    assert last_line == last_line.lstrip(), f"{name}: indented text before the schema"
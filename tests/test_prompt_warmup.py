@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.llm.models import ModelProvider
+from src.utils import llm as llm_module
+
+
+@pytest.fixture(autouse=True)
+def _fresh_warmed():
+    llm_module._WARMED.clear()
+    yield
+    llm_module._WARMED.clear()
+
+
+def test_warm_prompt_names_only_selected_personas():
+    names = llm_module.warm_prompt_names(["warren_buffett", "technical_analyst", "start_node", "ben_graham"])
+    assert names == ("hedge-fund/ben_graham", "hedge-fund/warren_buffett", "hedge-fund/portfolio_manager__decisions")
+
+
+def test_warm_prompt_caches_uses_api_keys_and_warms_once():
+    model = MagicMock()
+    names = ("hedge-fund/ben_graham", "hedge-fund/portfolio_manager__decisions")
+    keys = {"OPENAI_COMPATIBLE_API_KEY": "sk-req"}
+    with patch.object(llm_module, "get_model", return_value=model) as mock_get_model:
+        assert llm_module.warm_prompt_caches("qwen3", ModelProvider.OPENAI_COMPATIBLE, names, keys) == 2
+        assert llm_module.warm_prompt_caches("qwen3", ModelProvider.OPENAI_COMPATIBLE, names, keys) == 0
+
+    mock_get_model.assert_called_once_with("qwen3", ModelProvider.OPENAI_COMPATIBLE, keys)
+    model.model_copy.assert_called_once_with(update={"max_tokens": 1})
+    assert model.model_copy.return_value.invoke.call_count == 2
+
+
+def test_hosted_providers_are_not_warmed():
+    with patch.object(llm_module, "get_model") as mock_get_model:
+        assert llm_module.start_prompt_cache_warmup("gpt-4.1", ModelProvider.OPENAI, ("hedge-fund/ben_graham",)) is None
+        assert llm_module.warm_prompt_caches("gpt-4.1", ModelProvider.OPENAI, ("hedge-fund/ben_graham",)) == 0
+    mock_get_model.assert_not_called()
+
+
+def test_start_prompt_cache_warmup_runs_in_background():
+    with patch.object(llm_module, "warm_prompt_caches") as mock_warm:
+        thread = llm_module.start_prompt_cache_warmup("llama3", ModelProvider.OLLAMA, ("hedge-fund/ben_graham",))
+        thread.join(timeout=5)
+    assert thread.daemon
+    mock_warm.assert_called_once_with("llama3", ModelProvider.OLLAMA, ("hedge-fund/ben_graham",), None)
@@ -0,0 +1,22 @@
+import json
+from decimal import Decimal
+
+import numpy as np
+
+from src.utils.report import _dumps_indented, _format_context
+
+
+def test_dumps_indented_accepts_numpy_and_non_native_types():
+    decisions = {"AAPL": {"action": "buy", "quantity": np.int64(5), "confidence": np.float32(0.5), "short": np.bool_(False)}}
+    out = json.loads(_dumps_indented({**decisions, "cash": Decimal("1.50")}))
+    assert out == {"AAPL": {"action": "buy", "quantity": 5, "confidence": 0.5, "short": False}, "cash": "1.50"}
+
+
+def test_format_context_with_numpy_decisions():
+    context = _format_context(
+        {"AAPL": {"action": "hold", "quantity": np.int64(0)}},
+        {"warren_buffett": {"AAPL": {"signal": "bullish", "confidence": np.float64(80.0), "reasoning": "moat"}}},
+        {"AAPL": np.float64(100.0)},
+    )
+    assert '"quantity": 0' in context
+    assert "- **warren_buffett**: bullish (置信度: 80.0)" in context